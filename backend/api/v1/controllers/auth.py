@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
 from datetime import datetime, timedelta, timezone
@@ -10,6 +11,7 @@ from dotenv import load_dotenv
 from api.v1.schemas.token import TokenResponse
 from api.v1.services.token_service import TokenService
 from api.v1.services.user import UserService
+from api.v1.services.password_hasher import PasswordHasherBusy
 
 # Load environment variables
 load_dotenv()
@@ -63,7 +65,7 @@ class AuthController:
         return encoded_jwt, expire
 
     @staticmethod
-    def login(
+    async def login(
         response: Response,
         form_data: OAuth2PasswordRequestForm,
         db: Session
@@ -80,10 +82,18 @@ class AuthController:
             TokenResponse with access and refresh tokens
 
         Raises:
-            HTTPException: If authentication fails
+            HTTPException: If authentication fails, or 503 if the password hashing pool is saturated
         """
         # Authenticate user
-        user = UserService.authenticate_user(db, form_data.username, form_data.password)
+        try:
+            user = await UserService.authenticate_user(db, form_data.username, form_data.password)
+        except PasswordHasherBusy:
+            # Shed login bursts instead of queueing them behind the hashing pool
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,7 +124,8 @@ class AuthController:
         refresh_token, expires_at = AuthController.create_refresh_token(refresh_token_payload)
 
         # Save refresh token in database
-        TokenService.create_refresh_token(
+        await run_in_threadpool(
+            TokenService.create_refresh_token,
             db,
             user_id=user.id,
             jti=jti,
@@ -197,27 +208,39 @@ class AuthController:
                 detail="Invalid refresh token"
             )
 
-        # Check if token is valid in database and verify the token hash
-        if not TokenService.verify_refresh_token(db, jti, refresh_token):
+        if not jti or not email or not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token invalid, revoked, or expired"
+                detail="Invalid refresh token"
             )
 
-        # Revoke the used refresh token (token rotation for security)
-        TokenService.revoke_token(db, jti)
+        # Create the replacement refresh token
+        new_jti = str(uuid.uuid4())
 
-        # Get user from database
-        user = UserService.get_by_email(db, email)
-        if not user:
+        refresh_token_payload = {
+            "sub": email,
+            "user_id": user_id,
+            "jti": new_jti,
+        }
+        new_refresh_token, expires_at = AuthController.create_refresh_token(refresh_token_payload)
+
+        # Revoke the used refresh token and store the new one in one transaction (token rotation)
+        user = await run_in_threadpool(
+            TokenService.rotate_refresh_token,
+            db,
+            jti=jti,
+            email=email,
+            plain_refresh_token=refresh_token,
+            new_jti=new_jti,
+            new_refresh_token=new_refresh_token,
+            new_expires_at=expires_at
+        )
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
+                detail="Refresh token invalid, revoked, or expired"
             )
 
-        # Create new tokens
-        new_jti = str(uuid.uuid4())
-
         access_token_payload = {
             "sub": user.email,
             "user_id": user.id,
@@ -225,25 +248,7 @@ class AuthController:
             "last_name": user.last_name,
             "admin": user.admin,
         }
-
-        refresh_token_payload = {
-            "sub": user.email,
-            "user_id": user.id,
-            "jti": new_jti,
-        }
-
-        # Create tokens
         access_token = AuthController.create_access_token(access_token_payload)
-        new_refresh_token, expires_at = AuthController.create_refresh_token(refresh_token_payload)
-
-        # Save new refresh token in database
-        TokenService.create_refresh_token(
-            db,
-            user_id=user.id,
-            jti=new_jti,
-            refresh_token=new_refresh_token,
-            expires_at=expires_at
-        )
 
         # Set cookies
         response.set_cookie(
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from api.v1.services.author import AuthorService
+from api.v1.services.cache import response_cache, AUTHORS
 from api.v1.schemas.author import AuthorRead
 from typing import List
 
@@ -9,7 +10,7 @@ from typing import List
 class AuthorController:
     @staticmethod
     def get_authors(db: Session) -> List[AuthorRead]:
-        return AuthorService.get_authors(db)
+        return response_cache.get_or_set(AUTHORS, None, lambda: AuthorService.get_authors(db))
 
     @staticmethod
     def get_author_by_id(author_id: int, db: Session) -> AuthorRead:
@@ -1,58 +1,114 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import List
+from fastapi.responses import Response
+from typing import List, Optional
 from api.v1.schemas.common import PaginatedResponse
 from api.v1.schemas.book import BookRead, BookReadSimpleWithReviewCount, BookReadSimpleWithRating, BookCreate
-from api.v1.schemas.query import BookFilter, ReviewFilter
+from api.v1.schemas.query import BookFilter, BookSearchFilter, ReviewFilter
 from api.v1.schemas.review import ReviewRead
 from api.v1.services.book import BookService
+from api.v1.services.cache import response_cache, book_namespace, reviews_namespace, BOOKS, RECOMMENDED
+from api.v1.utils.etag import make_etag, etag_matches
+from api.v1.utils.serialization import dumps, PreEncodedJSONResponse
 
 
 class BookController:
     @staticmethod
-    def get_books_paginated(filter_params: BookFilter, db: Session) -> PaginatedResponse[BookReadSimpleWithRating]:
-        result = BookService.get_books(db, filter_params)
+    async def get_books_paginated(filter_params: BookFilter, db: AsyncSession) -> Response:
+        # The page is cached as encoded JSON and sent as is, skipping response_model validation
+        body = await response_cache.aget_or_set(
+            BOOKS,
+            filter_params,
+            lambda: BookController._get_books_paginated(filter_params, db)
+        )
+        return PreEncodedJSONResponse(content=body)
 
-        if not result.data and filter_params.page > 1:
+    @staticmethod
+    async def search_books(filter_params: BookSearchFilter, db: AsyncSession) -> Response:
+        # Search pages share the book listing cache, the query is part of the key
+        return await BookController.get_books_paginated(filter_params, db)
+
+    @staticmethod
+    async def _get_books_paginated(filter_params: BookFilter, db: AsyncSession) -> str:
+        try:
+            result = await BookService.get_books(db, filter_params)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
+        if not result["data"] and filter_params.page > 1:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No books found for page {filter_params.page}"
             )
 
-        return result
+        return dumps(result)
 
     @staticmethod
-    def get_book_by_id(book_id: int, db: Session) -> BookRead:
-        book = BookService.get_book_by_id(book_id, db)
+    async def get_book_by_id(book_id: int, db: AsyncSession, if_none_match: Optional[str] = None) -> Response:
+        # Cached per book with the ETag of its encoded body, a cache hit answers without querying
+        detail = await response_cache.aget_or_set(
+            book_namespace(book_id),
+            None,
+            lambda: BookController._get_book_by_id(book_id, db)
+        )
+        headers = {"ETag": detail["etag"]}
+        if etag_matches(if_none_match, detail["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return PreEncodedJSONResponse(content=detail["body"], headers=headers)
+
+    @staticmethod
+    async def _get_book_by_id(book_id: int, db: AsyncSession) -> dict:
+        book = await BookService.get_book_detail(book_id, db)
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book not found with id {book_id}"
             )
-        return book
+        body = dumps(book)
+        return {"etag": make_etag(body), "body": body}
 
     @staticmethod
-    def get_on_sale_books(db: Session) -> List[BookRead]:
-        return BookService.get_on_sale_books(db)
+    async def get_on_sale_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        return await BookService.get_on_sale_books(db)
 
     @staticmethod
-    def get_popular_books(db: Session) -> List[BookReadSimpleWithReviewCount]:
-        return BookService.get_popular_books(db)
+    async def get_popular_books(db: AsyncSession) -> List[BookReadSimpleWithReviewCount]:
+        return await BookService.get_popular_books(db)
 
     @staticmethod
-    def get_recommended_books(db: Session) -> List[BookReadSimpleWithRating]:
-        return BookService.get_recommended_books(db)
+    async def get_recommended_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        return await response_cache.aget_or_set(
+            RECOMMENDED,
+            None,
+            lambda: BookService.get_recommended_books(db)
+        )
 
     @staticmethod
-    def get_reviews_by_book_id(book_id: int, filter_params: ReviewFilter, db: Session) -> PaginatedResponse[ReviewRead]:
-        book = BookService.get_book_by_id(book_id, db)
-        if not book:
+    async def get_reviews_by_book_id(book_id: int, filter_params: ReviewFilter, db: AsyncSession) -> PaginatedResponse[ReviewRead]:
+        return await response_cache.aget_or_set(
+            reviews_namespace(book_id),
+            filter_params,
+            lambda: BookController._get_reviews_by_book_id(book_id, filter_params, db)
+        )
+
+    @staticmethod
+    async def _get_reviews_by_book_id(book_id: int, filter_params: ReviewFilter, db: AsyncSession) -> PaginatedResponse[ReviewRead]:
+        if not await BookService.book_exists(book_id, db):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book not found with id {book_id}"
             )
-        return BookService.get_reviews_by_book_id(book_id, filter_params, db)
+        try:
+            return await BookService.get_reviews_by_book_id(book_id, filter_params, db)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
 
     @staticmethod
-    def create_book(book_data: BookCreate, db: Session) -> BookRead:
-        return BookService.create_book(book_data, db)
+    async def create_book(book_data: BookCreate, db: AsyncSession) -> BookRead:
+        return await BookService.create_book(book_data, db)
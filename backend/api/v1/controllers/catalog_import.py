@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, UploadFile, status
+from typing import Optional
+
+from api.v1.schemas.catalog_import import ImportFormat, ImportKind, ImportReport
+from api.v1.services.catalog_import import CatalogImportService
+
+
+class CatalogImportController:
+    @staticmethod
+    def import_file(kind: ImportKind, file: UploadFile, file_format: Optional[ImportFormat], db: Session) -> ImportReport:
+        file_format = file_format or CatalogImportController.detect_format(file.filename)
+        if file_format is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown file format, use a .csv or .ndjson file or set the format parameter"
+            )
+
+        try:
+            rows = CatalogImportService.read_rows(file.file, file_format)
+            return CatalogImportService.import_rows(kind, rows, db)
+        except (UnicodeDecodeError, ValueError) as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unreadable import file: {e}"
+            )
+
+    @staticmethod
+    def detect_format(filename: Optional[str]) -> Optional[ImportFormat]:
+        extension = (filename or "").rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return ImportFormat.CSV
+        if extension in ("ndjson", "jsonl"):
+            return ImportFormat.NDJSON
+        return None
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from api.v1.services.category import CategoryService
+from api.v1.services.cache import response_cache, CATEGORIES
 from api.v1.schemas.category import CategoryRead
 from typing import List
 
@@ -9,7 +10,7 @@ from typing import List
 class CategoryController:
     @staticmethod
     def get_categories(db: Session) -> List[CategoryRead]:
-        return CategoryService.get_categories(db)
+        return response_cache.get_or_set(CATEGORIES, None, lambda: CategoryService.get_categories(db))
 
     @staticmethod
     def get_category_by_id(category_id: int, db: Session) -> CategoryRead:
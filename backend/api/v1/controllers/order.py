@@ -1,12 +1,21 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from api.v1.schemas.order import OrderClientInput, OrderRead
+from typing import Optional, Tuple
+from api.v1.schemas.order import OrderClientInput, OrderRead, OrderSummary
+from api.v1.schemas.query import OrderFilter
+from api.v1.schemas.common import PaginatedResponse
+from api.v1.services.idempotency import IdempotencyService
 from api.v1.services.order import OrderService
 
 
 class OrderController:
     @staticmethod
-    def create_order(order_data: OrderClientInput, db: Session, user_id: int) -> OrderRead:
+    async def create_order(
+        order_data: OrderClientInput,
+        db: AsyncSession,
+        user_id: int,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[OrderRead, bool]:
         """
         Create an order with validation of prices against database
 
@@ -14,14 +23,53 @@ class OrderController:
             order_data: Order data from client
             db: Database session
             user_id: ID of the user placing the order
+            idempotency_key: Optional Idempotency-Key header value
 
         Returns:
-            Created order
+            Tuple of (order, True if it was replayed from an earlier request with the same key)
 
         Raises:
             HTTPException:
                 - 400 Bad Request with OrderError containing:
                   - mismatches: List of books with price mismatches
                   - not_found: List of book IDs that were not found
+                - 422 Unprocessable Entity if the key was used for a different request
         """
-        return OrderService.create_order_from_client_input(order_data, db, user_id)
+        if idempotency_key is not None:
+            request_hash = IdempotencyService.request_hash(order_data.model_dump(mode="json"))
+            # Waits for a concurrent request holding the same key
+            stored = await IdempotencyService.claim(user_id, idempotency_key, request_hash, db)
+            if stored is not None:
+                await db.rollback()
+                return OrderRead.model_validate(stored), True
+
+        order = await OrderService.create_order_from_client_input(order_data, db, user_id, idempotency_key)
+        return order, False
+
+    @staticmethod
+    async def get_orders(
+        filter_params: OrderFilter,
+        db: AsyncSession,
+        user_id: Optional[int] = None
+    ) -> PaginatedResponse[OrderSummary]:
+        """
+        Get a page of order history, newest first
+
+        Args:
+            filter_params: Pagination parameters
+            db: Database session
+            user_id: Only list the orders of this user, all users when None
+
+        Returns:
+            Paginated order summaries
+
+        Raises:
+            HTTPException: 400 Bad Request if the cursor is invalid
+        """
+        try:
+            return await OrderService.get_orders(filter_params, db, user_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
@@ -1,10 +1,13 @@
-from database.postgres import PostgresDatabase
+from database.postgres import get_database
 
-db_instance = PostgresDatabase()
 
 def get_db_session():
-    db = next(db_instance.get_session())
+    db = next(get_database().get_session())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db_session():
+    async with get_database().async_session_factory() as db:
+        yield db
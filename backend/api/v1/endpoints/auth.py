@@ -9,7 +9,7 @@ from api.v1.dependencies.dependencies import get_db_session
 router = APIRouter(prefix="/auth")
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db_session)
@@ -25,7 +25,7 @@ def login(
     Returns:
         TokenResponse with access and refresh tokens
     """
-    return AuthController.login(response, form_data, db)
+    return await AuthController.login(response, form_data, db)
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from api.v1.middlewares.auth_middleware import get_current_admin_user
 from api.v1.schemas.common import PaginatedResponse
 from api.v1.schemas.review import ReviewRead, ReviewCreate
 from api.v1.schemas.book import BookRead, BookReadSimple, BookReadSimpleWithReviewCount, BookReadSimpleWithRating, BookCreate
-from api.v1.schemas.query import BookFilter, ReviewFilter
+from api.v1.schemas.query import BookFilter, BookSearchFilter, ReviewFilter
 from api.v1.controllers.book import BookController
 from api.v1.controllers.review import ReviewController
-from api.v1.dependencies.dependencies import get_db_session
+from api.v1.dependencies.dependencies import get_async_db_session
 
 router = APIRouter(prefix="/books")
 
@@ -18,8 +18,8 @@ router = APIRouter(prefix="/books")
             status_code=status.HTTP_200_OK,
             summary="Get list of books on sale",
             description="Retrieve books with biggest discounts.")
-def get_on_sale_books(db: Session = Depends(get_db_session)):
-    return BookController.get_on_sale_books(db)
+async def get_on_sale_books(db: AsyncSession = Depends(get_async_db_session)):
+    return await BookController.get_on_sale_books(db)
 
 
 @router.get("/popular",
@@ -27,8 +27,8 @@ def get_on_sale_books(db: Session = Depends(get_db_session)):
             status_code=status.HTTP_200_OK,
             summary="Get list of popular books",
             description="Retrieve books with most reviews.")
-def get_popular_books(db: Session = Depends(get_db_session)):
-    return BookController.get_popular_books(db)
+async def get_popular_books(db: AsyncSession = Depends(get_async_db_session)):
+    return await BookController.get_popular_books(db)
 
 
 @router.get("/recommended",
@@ -36,8 +36,20 @@ def get_popular_books(db: Session = Depends(get_db_session)):
             status_code=status.HTTP_200_OK,
             summary="Get list of recommended books",
             description="Retrieve books with highest average rating.")
-def get_recommended_books(db: Session = Depends(get_db_session)):
-    return BookController.get_recommended_books(db)
+async def get_recommended_books(db: AsyncSession = Depends(get_async_db_session)):
+    return await BookController.get_recommended_books(db)
+
+
+@router.get("/search",
+            response_model=PaginatedResponse[BookReadSimpleWithRating],
+            status_code=status.HTTP_200_OK,
+            summary="Search books",
+            description="Full-text search over book titles, summaries and author names, ranked by relevance, with the same filters, sorting and pagination as the book list.")
+async def search_books(
+    filter_params: BookSearchFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    return await BookController.search_books(filter_params, db)
 
 
 @router.get("/{book_id}",
@@ -45,12 +57,16 @@ def get_recommended_books(db: Session = Depends(get_db_session)):
             status_code=status.HTTP_200_OK,
             summary="Get a book by ID",
             description="Retrieve a book with its full author and category details.")
-def get_book(
+async def get_book(
     book_id: int,
-    db: Session = Depends(get_db_session)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_session)
 ):
-    """Get a book by ID with its full author and category details."""
-    return BookController.get_book_by_id(book_id, db)
+    """Get a book by ID with its full author and category details.
+
+    The response carries an ETag; send it back in If-None-Match to get a 304 when the book is unchanged.
+    """
+    return await BookController.get_book_by_id(book_id, db, if_none_match)
 
 
 @router.get("",
@@ -58,11 +74,11 @@ def get_book(
             status_code=status.HTTP_200_OK,
             summary="Get paginated list of books",
             description="Retrieve books with their authors and categories, with filtering and sorting options.")
-def list_books(
+async def list_books(
     filter_params: BookFilter = Depends(),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
-    return BookController.get_books_paginated(filter_params, db)
+    return await BookController.get_books_paginated(filter_params, db)
 
 
 @router.get("/{book_id}/reviews",
@@ -70,16 +86,16 @@ def list_books(
             status_code=status.HTTP_200_OK,
             summary="Get list of reviews for a book",
             description="Retrieve reviews for a specific book.")
-def get_reviews_for_book(
+async def get_reviews_for_book(
     book_id: int,
     filter_params: ReviewFilter = Depends(),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Get a filtered and paginated list of reviews for a specific book.
 
     This endpoint returns reviews for a specific book, with filtering and sorting options.
     """
-    return BookController.get_reviews_by_book_id(book_id, filter_params, db)
+    return await BookController.get_reviews_by_book_id(book_id, filter_params, db)
 
 
 @router.post("/{book_id}/reviews",
@@ -87,18 +103,18 @@ def get_reviews_for_book(
              status_code=status.HTTP_201_CREATED,
              summary="Create a new review for a book",
              description="Create a new review for a specific book.")
-def create_review_for_book(
+async def create_review_for_book(
     book_id: int,
     review_data: ReviewCreate,
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Create a new review for a specific book.
 
     This endpoint creates a new review for a specific book.
     """
-    return ReviewController.post_review_for_book(book_id, review_data, db)
+    return await ReviewController.post_review_for_book(book_id, review_data, db)
 
 
 @router.post("", response_model=BookRead, status_code=status.HTTP_201_CREATED)
-def create_book(book_data: BookCreate, db: Session = Depends(get_db_session), current_user: dict = Depends(get_current_admin_user)):
-    return BookController.create_book(book_data, db)
\ No newline at end of file
+async def create_book(book_data: BookCreate, db: AsyncSession = Depends(get_async_db_session), current_user: dict = Depends(get_current_admin_user)):
+    return await BookController.create_book(book_data, db)
\ No newline at end of file
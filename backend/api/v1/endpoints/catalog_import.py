@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, File, UploadFile, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from api.v1.controllers.catalog_import import CatalogImportController
+from api.v1.dependencies.dependencies import get_db_session
+from api.v1.middlewares.auth_middleware import get_current_admin_user
+from api.v1.schemas.catalog_import import ImportFormat, ImportKind, ImportReport
+from models.user import User
+
+router = APIRouter(prefix="/import")
+
+
+@router.post("/{kind}",
+             response_model=ImportReport,
+             status_code=status.HTTP_200_OK,
+             summary="Bulk import catalog rows",
+             description="Load authors, categories, books or discounts from a CSV (with header) or NDJSON file with COPY. Invalid rows are skipped and listed in the report (admin only).")
+def import_catalog(
+    kind: ImportKind,
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    db: Session = Depends(get_db_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Runs in the threadpool, the file is read and copied in chunks."""
+    return CatalogImportController.import_file(kind, file, format, db)
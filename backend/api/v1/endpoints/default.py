@@ -1,9 +1,40 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 
+from api.v1.middlewares.auth_middleware import get_current_admin_user
+from api.v1.services.cache import response_cache
+from api.v1.services.password_hasher import PasswordHasher
+from api.v1.services.token_purge import TokenPurgeService
+from database.postgres import get_database
+from models.user import User
+
 router = APIRouter()
 
 
 @router.get("/health", status_code=status.HTTP_200_OK, summary="Health check")
 async def health_check():
     return JSONResponse(content={"status": "ok"})
+
+
+@router.get("/metrics/cache", status_code=status.HTTP_200_OK, summary="Response cache statistics")
+def cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """Hit/miss counters per cache namespace (admin only)"""
+    return response_cache.stats()
+
+
+@router.get("/metrics/db", status_code=status.HTTP_200_OK, summary="Connection pool statistics")
+def db_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    """Checkout wait times and saturation of this worker's connection pools (admin only)"""
+    return get_database().pool_stats()
+
+
+@router.get("/metrics/password-hashing", status_code=status.HTTP_200_OK, summary="Password hashing pool statistics")
+def password_hashing_stats(current_user: User = Depends(get_current_admin_user)):
+    """Load, rejections and latency of this worker's password hashing pool (admin only)"""
+    return PasswordHasher.stats()
+
+
+@router.get("/metrics/token-purge", status_code=status.HTTP_200_OK, summary="Refresh token purge statistics")
+def token_purge_stats(current_user: User = Depends(get_current_admin_user)):
+    """Tokens purged by this worker and the token table size at its last run (admin only)"""
+    return TokenPurgeService.stats()
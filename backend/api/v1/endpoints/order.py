@@ -1,14 +1,47 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
-from api.v1.schemas.order import OrderRead, OrderClientInput, OrderError
+from fastapi import APIRouter, Depends, Header, Response, status, HTTPException
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.v1.schemas.order import OrderRead, OrderClientInput, OrderError, OrderSummary
+from api.v1.schemas.query import OrderFilter, OrderAdminFilter
+from api.v1.schemas.common import PaginatedResponse
 from api.v1.controllers.order import OrderController
-from api.v1.dependencies.dependencies import get_db_session
-from api.v1.middlewares.auth_middleware import get_current_user
+from api.v1.dependencies.dependencies import get_async_db_session
+from api.v1.middlewares.auth_middleware import get_current_user, get_current_admin_user
 from models.user import User
 
 router = APIRouter(prefix="/orders")
 
 
+@router.get(
+    "",
+    response_model=PaginatedResponse[OrderSummary],
+    status_code=status.HTTP_200_OK,
+    summary="List my orders",
+    description="Order history of the current user, newest first. Use meta.next_cursor to page through long histories."
+)
+async def get_my_orders(
+    filter_params: OrderFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    return await OrderController.get_orders(filter_params, db, current_user.id)
+
+
+@router.get(
+    "/all",
+    response_model=PaginatedResponse[OrderSummary],
+    status_code=status.HTTP_200_OK,
+    summary="List all orders",
+    description="Orders of all users or of one user, newest first (admin only)"
+)
+async def get_all_orders(
+    filter_params: OrderAdminFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    return await OrderController.get_orders(filter_params, db, filter_params.user_id)
+
+
 @router.post(
     "",
     response_model=OrderRead,
@@ -20,9 +53,11 @@ router = APIRouter(prefix="/orders")
         }
     }
 )
-def create_order(
+async def create_order(
     order_data: OrderClientInput,
-    db: Session = Depends(get_db_session),
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_async_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -33,9 +68,13 @@ def create_order(
     - Validates that all books exist
     - Validates that client prices match database prices
     - Creates the order with the validated data
+    - With an Idempotency-Key header, retries with the same key and body
+      return the first order instead of creating another one
 
     Args:
         order_data: Order data from client with book_id, quantity, and price
+        response: Response, gets Idempotent-Replayed on replays
+        idempotency_key: Optional key identifying this checkout attempt
         db: Database session
         current_user: Authenticated user
 
@@ -47,6 +86,7 @@ def create_order(
             - 400 Bad Request with OrderError containing:
               - mismatches: List of books with price mismatches
               - not_found: List of book IDs that were not found
+            - 422 Unprocessable Entity if the key was used for a different order
     """
     # Validate order has items
     if not order_data.order_items or len(order_data.order_items) == 0:
@@ -55,4 +95,7 @@ def create_order(
             detail="Order must contain at least one item"
         )
 
-    return OrderController.create_order(order_data, db, current_user.id)
+    order, replayed = await OrderController.create_order(order_data, db, current_user.id, idempotency_key)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return order
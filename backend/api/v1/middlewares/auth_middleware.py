@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status, Cookie
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 from sqlmodel import Session
 from typing import Optional
 import os
@@ -8,6 +9,7 @@ from dotenv import load_dotenv
 
 from api.v1.schemas.token import AccessTokenPayload
 from api.v1.services.user import UserService
+from api.v1.services.principal_cache import PrincipalCache
 from models.user import User
 from api.v1.dependencies.dependencies import get_db_session
 
@@ -56,14 +58,20 @@ async def get_current_user(
 
         # Create token payload object
         token_data = AccessTokenPayload(**payload)
-    except JWTError:
+    except (JWTError, ValidationError):
         raise credentials_exception
 
+    # Recently authenticated users are served from memory
+    user = PrincipalCache.get(token_data.user_id, email)
+    if user is not None:
+        return user
+
     # Get user from database
     user = UserService.get_by_email(db, email)
-    if user is None:
+    if user is None or user.id != token_data.user_id:
         raise credentials_exception
 
+    PrincipalCache.set(user)
     return user
 
 
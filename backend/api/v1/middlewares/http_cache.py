@@ -0,0 +1,106 @@
+import os
+import re
+from datetime import date
+from typing import Callable, Optional, Sequence
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.v1.services.cache import response_cache, CATALOG_VERSION, REVIEWS_VERSION
+from api.v1.services.top_books import TopBooksService
+from api.v1.utils.etag import make_etag, etag_matches
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+
+
+class CachePolicy:
+    """
+    Caching rules for the GET routes matching a path pattern
+
+    Args:
+        pattern: Regular expression matched against the full request path
+        cache_control: Cache-Control header value for 200 and 304 responses
+        versions: Data versions the response depends on; when set the ETag is
+            derived from them and the route can answer 304 without running
+        stamp: Optional callable identifying in-process data the response is
+            served from, used for the ETag instead of or next to versions
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        cache_control: str,
+        versions: Sequence[str] = (),
+        stamp: Optional[Callable[[], str]] = None
+    ):
+        self.pattern = re.compile(pattern)
+        self.cache_control = cache_control
+        self.versions = list(versions)
+        self.stamp = stamp
+
+
+def _cache_control(max_age: int, stale_while_revalidate: int) -> str:
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+# First match wins
+CACHE_POLICIES = [
+    CachePolicy(r"^/api/v1/(categories|authors)(/\d+)?$", _cache_control(300, 3600), [CATALOG_VERSION]),
+    CachePolicy(r"^/api/v1/books/\d+/reviews$", _cache_control(30, 120), [REVIEWS_VERSION]),
+    # Book details set their own content ETag
+    CachePolicy(r"^/api/v1/books/\d+$", _cache_control(60, 600)),
+    # Served from the in-memory top-N lists, which reload after writes on their own schedule
+    CachePolicy(r"^/api/v1/books/(on-sale|popular)$", _cache_control(30, 300), stamp=TopBooksService.stamp),
+    # Listings embed prices, authors, categories and ratings
+    CachePolicy(
+        r"^/api/v1/books(/(search|recommended))?$",
+        _cache_control(30, 300),
+        [CATALOG_VERSION, REVIEWS_VERSION]
+    ),
+]
+
+
+class HTTPCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Adds Cache-Control and ETag headers to public read endpoints and answers
+    conditional requests.
+
+    ETags come from data versions, bumped when catalog or review writes
+    commit, or from the load stamp of in-memory data, so an unchanged
+    resource gets a 304 before the endpoint runs.
+    The date is part of the stamp because prices also change when
+    discounts start or end.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        policy = self.policy_for(request)
+        if policy is None:
+            return await call_next(request)
+
+        etag = None
+        if policy.versions or policy.stamp:
+            version = await response_cache.version(policy.versions) if policy.versions else ""
+            stamp = policy.stamp() if policy.stamp else ""
+            etag = make_etag(request.url.path, str(request.query_params), date.today().isoformat(), version, stamp)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": policy.cache_control}
+                )
+
+        response = await call_next(request)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response.headers.setdefault("Cache-Control", policy.cache_control)
+            if etag is not None and "etag" not in response.headers:
+                response.headers["ETag"] = etag
+        return response
+
+    @staticmethod
+    def policy_for(request: Request) -> Optional[CachePolicy]:
+        if not HTTP_CACHE_ENABLED or request.method not in ("GET", "HEAD"):
+            return None
+        for policy in CACHE_POLICIES:
+            if policy.pattern.match(request.url.path):
+                return policy
+        return None
@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class ImportKind(str, Enum):
+    """Catalog entities that can be bulk imported"""
+    AUTHORS = "authors"
+    CATEGORIES = "categories"
+    BOOKS = "books"
+    DISCOUNTS = "discounts"
+
+
+class ImportFormat(str, Enum):
+    """Import file formats"""
+    CSV = "csv"  # Header row with the field names
+    NDJSON = "ndjson"  # One JSON object per line
+
+
+class AuthorImportRow(BaseModel):
+    """Author row of an import file; id is optional and lets books of the same feed reference it"""
+    id: Optional[int] = Field(None, gt=0)
+    author_name: str = Field(min_length=1, max_length=255)
+    author_bio: Optional[str] = None
+
+
+class CategoryImportRow(BaseModel):
+    """Category row of an import file"""
+    id: Optional[int] = Field(None, gt=0)
+    category_name: str = Field(min_length=1, max_length=120)
+    category_desc: str = Field(max_length=255)
+
+
+class BookImportRow(BaseModel):
+    """Book row of an import file, referencing existing or imported authors and categories"""
+    id: Optional[int] = Field(None, gt=0)
+    category_id: Optional[int] = None
+    author_id: Optional[int] = None
+    book_title: str = Field(min_length=1, max_length=255)
+    book_summary: Optional[str] = None
+    book_price: Decimal = Field(ge=0, max_digits=5, decimal_places=2)
+    book_cover_photo: Optional[str] = Field(None, max_length=255)
+
+
+class DiscountImportRow(BaseModel):
+    """Discount row of an import file"""
+    id: Optional[int] = Field(None, gt=0)
+    book_id: int
+    discount_start_date: Optional[date] = None
+    discount_end_date: Optional[date] = None
+    discount_price: Decimal = Field(ge=0, max_digits=5, decimal_places=2)
+
+    @model_validator(mode="after")
+    def check_dates(self) -> "DiscountImportRow":
+        if self.discount_start_date and self.discount_end_date and self.discount_end_date < self.discount_start_date:
+            raise ValueError("Discount end date must be after start date")
+        return self
+
+
+class ImportRejectedRow(BaseModel):
+    """A row left out of the import"""
+    line: int
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk import"""
+    kind: ImportKind
+    received: int
+    imported: int
+    rejected: int
+    # Capped, see rejected for the full count
+    rejected_rows: List[ImportRejectedRow]
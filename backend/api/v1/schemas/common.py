@@ -5,10 +5,13 @@ from pydantic.generics import GenericModel
 T = TypeVar("T")
 
 class PaginationMeta(BaseModel):
-    total: int
-    total_pages: int
+    # None when the listing was requested without a total
+    total: Optional[int]
+    total_pages: Optional[int]
     page: int
     size: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 class PaginatedResponse(GenericModel, Generic[T]):
     data: List[T]
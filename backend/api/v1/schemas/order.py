@@ -68,6 +68,17 @@ class OrderRead(OrderBase):
         from_attributes = True
 
 
+class OrderSummary(OrderBase):
+    """Schema for an order in order history listings, without its items"""
+    id: int
+    user_id: int
+    item_count: int
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
+
+
 class OrderError(BaseModel):
     mismatches: List[BookReadSimple]
     not_found: List[int]
\ No newline at end of file
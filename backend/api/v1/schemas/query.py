@@ -6,6 +6,7 @@ class PaginationParams(BaseModel):
     """Base pagination parameters for query parameters"""
     page: int = Field(1, ge=1, description="Page number, starting from 1")
     size: int = Field(10, ge=1, le=100, description="Number of items per page")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from meta.next_cursor; when set, page is ignored and results continue after the cursor")
 
 class SortDirection(str, Enum):
     """Sort direction enum for query parameters"""
@@ -19,6 +20,13 @@ class BookSortField(str, Enum):
     POPULARITY = "popularity"  # Sort by number of reviews
     PRICE = "price"  # Sort by final price
 
+class CountStrategy(str, Enum):
+    """How the total of a paginated listing is computed"""
+    EXACT = "exact"  # COUNT(*) OVER() in the page query
+    CACHED = "cached"  # Exact count, cached per filter
+    ESTIMATE = "estimate"  # Planner estimate, exact count for small results
+    NONE = "none"  # No total, use next_cursor to detect the last page
+
 class ReviewSortField(str, Enum):
     """Fields that can be used for sorting reviews"""
     DATE = "date"  # Sort by review date
@@ -32,11 +40,21 @@ class BookFilter(PaginationParams):
     # Sorting options
     sort_by: Optional[BookSortField] = Field(BookSortField.ON_SALE, description="Field to sort by: on_sale, popularity, or price")
     sort_direction: Optional[SortDirection] = Field(SortDirection.DESC, description="Sort direction: asc or desc")
+
+    # Total count
+    count: Optional[CountStrategy] = Field(CountStrategy.EXACT, description="How meta.total is computed: exact, cached, estimate or none")
     
     class Config:
         """Pydantic config"""
         use_enum_values = True
 
+class BookSearchFilter(BookFilter):
+    """Book filter with a full-text search query"""
+    q: str = Field(..., min_length=1, max_length=200, description="Search terms matched against title, author name and summary; supports quoted phrases, OR and -exclusion")
+
+    # Results are ranked by relevance unless another sort is requested
+    sort_by: Optional[BookSortField] = Field(None, description="Field to sort by: on_sale, popularity, or price; relevance when omitted")
+
 class ReviewFilter(PaginationParams):
     """Base filter model for review queries"""
     rating_star: Optional[int] = Field(None, ge=1, le=5, description="Filter reviews with rating equal to this value (1-5)")
@@ -48,3 +66,11 @@ class ReviewFilter(PaginationParams):
     class Config:
         """Pydantic config"""
         use_enum_values = True
+
+class OrderFilter(PaginationParams):
+    """Filter model for order history queries, newest orders first"""
+    pass
+
+class OrderAdminFilter(OrderFilter):
+    """Filter model for order history queries across users"""
+    user_id: Optional[int] = Field(None, description="Filter by user ID")
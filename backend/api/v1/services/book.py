@@ -1,24 +1,33 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Tuple
 
 from api.v1.schemas.book import BookRead, BookReadSimple, BookReadSimpleWithReviewCount, BookReadSimpleWithRating, BookCreate
-from api.v1.schemas.query import BookFilter, ReviewFilter, ReviewSortField, SortDirection, BookSortField
+from api.v1.schemas.query import BookFilter, ReviewFilter, ReviewSortField, SortDirection, BookSortField, CountStrategy
 from api.v1.schemas.common import PaginatedResponse, PaginationMeta
 from api.v1.schemas.review import ReviewRead
+from models.author import Author
 from models.book import Book
+from models.category import Category
 from models.review import Review
-from models.discount import Discount
-from api.v1.services.discount import DiscountService
-from api.v1.services.author import AuthorService
-from api.v1.services.category import CategoryService
-from api.v1.services.review import ReviewService
-from datetime import date
-from sqlalchemy import desc, or_, func, case
+from api.v1.services.book_listing import BookListingQuery
+from api.v1.services.top_books import TopBooksService
+from api.v1.services.book_existence import BookExistenceService
+from api.v1.utils.pagination import encode_cursor, decode_cursor, keyset_condition
+from datetime import datetime
+from sqlalchemy import desc, func, select, true
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Value types of the review sort keys, used to restore cursor values
+REVIEW_SORT_KEY_TYPES = {
+    "id": int,
+    "review_date": datetime.fromisoformat,
+}
 
 
 class BookService:
     @staticmethod
-    def get_books(db: Session, filter_params: BookFilter) -> PaginatedResponse[BookReadSimpleWithRating]:
+    async def get_books(db: AsyncSession, filter_params: BookFilter) -> Dict[str, Any]:
         """
         Get paginated books with filtering and sorting options
 
@@ -27,264 +36,174 @@ class BookService:
             filter_params: Filter and pagination parameters
 
         Returns:
-            PaginatedResponse containing list of books and pagination metadata
+            JSON-ready dict shaped like PaginatedResponse[BookReadSimpleWithRating],
+            built from the query rows without validation
         """
-        today = date.today()
-
-        valid_discounts = (
-            db.query(
-                Discount.book_id,
-                func.min(Discount.discount_price).label("discount_price")
-            )
-            .filter(
-                or_(
-                    Discount.discount_end_date == None,
-                    Discount.discount_end_date > today
-                )
-            )
-            .group_by(Discount.book_id)
-            .subquery()
-        )
-
-        # Calculate sub price and final price for sorting
-        sub_price = case(
-            (valid_discounts.c.discount_price.is_(None), 0),
-            else_=Book.book_price - valid_discounts.c.discount_price
-        ).label("sub_price")
-
-        final_price = case(
-            (valid_discounts.c.discount_price.is_(None), Book.book_price),
-            else_=valid_discounts.c.discount_price
-        ).label("final_price")
-
-        # Create a subquery to get average rating for each book
-        avg_ratings = (
-            db.query(
-                Review.book_id,
-                func.round(func.avg(Review.rating_star), 2).label("avg_rating"),
-                func.count(Review.id).label("review_count")
-            )
-            .group_by(Review.book_id)
-            .subquery()
-        )
-
-        query = (
-            db.query(
-                Book,
-                sub_price,
-                final_price,
-                func.coalesce(avg_ratings.c.review_count, 0).label("review_count"),
-                func.coalesce(avg_ratings.c.avg_rating, 0).label("avg_rating")
-            )
-            .outerjoin(valid_discounts, Book.id == valid_discounts.c.book_id)
-            .outerjoin(avg_ratings, Book.id == avg_ratings.c.book_id)
-            .options(joinedload(Book.discounts))
-            .group_by(Book.id, valid_discounts.c.discount_price, avg_ratings.c.review_count, avg_ratings.c.avg_rating)
+        listing = (
+            BookListingQuery()
+            .filter(filter_params)
+            .sort(filter_params.sort_by, filter_params.sort_direction)
         )
 
-        if filter_params.category_id is not None:
-            query = query.filter(Book.category_id == filter_params.category_id)
-
-        if filter_params.author_id is not None:
-            query = query.filter(Book.author_id == filter_params.author_id)
-
-        if filter_params.rating_star is not None:
-            # Filter books with average rating >= rating_star
-            query = query.filter(avg_ratings.c.avg_rating >= filter_params.rating_star)
-
-        if filter_params.sort_by == BookSortField.ON_SALE:
-            # Default: Sort by sub price (desc) and then by final price (asc)
-            if filter_params.sort_direction == SortDirection.DESC:
-                query = query.order_by(desc(sub_price), final_price)
+        # Totals are computed before the cursor condition narrows the statement
+        total_count, total_is_estimate = None, False
+        strategy = filter_params.count or CountStrategy.EXACT
+        if strategy == CountStrategy.EXACT:
+            if filter_params.cursor:
+                total_count = await listing.count(db)
             else:
-                query = query.order_by(sub_price, final_price)
-
-        elif filter_params.sort_by == BookSortField.POPULARITY:
-            # Sort by review count (desc) and then by final price (asc)
-            if filter_params.sort_direction == SortDirection.DESC:
-                query = query.order_by(desc("review_count"), final_price)
-            else:
-                query = query.order_by("review_count", final_price)
-
-        elif filter_params.sort_by == BookSortField.PRICE:
-            # Sort by final price (desc or asc)
-            if filter_params.sort_direction == SortDirection.DESC:
-                query = query.order_by(desc(final_price))
-            else:
-                query = query.order_by(final_price)
-
-        total_count = query.count()
-
-        offset = (filter_params.page - 1) * filter_params.size
-        query = query.offset(offset).limit(filter_params.size)
-
-        query_result = query.all()
-
-        result = []
-        for row in query_result:
-            book = row.Book
-
-            author = AuthorService.get_author_by_id(book.author_id, db)
-            category = CategoryService.get_category_by_id(book.category_id, db)
-
-            # Get valid discounts for this book
-            valid_book_discounts = [
-                d for d in book.discounts
-                if d.discount_end_date is None or d.discount_end_date > today
-            ]
-
-            # Sort discounts by discount amount (biggest discount first)
-            if valid_book_discounts:
-                valid_book_discounts.sort(key=lambda d: book.book_price - d.discount_price, reverse=True)
-
-            book_dict = book.__dict__.copy()
-            avg_rating = round(float(row.avg_rating), 2) if row.avg_rating is not None else 0.0
-            rating_dict = {"review_count": row.review_count, "average_rating": avg_rating}
-            book_dict["discount"] = valid_book_discounts[0] if valid_book_discounts else None
-            book_dict["author"] = author
-            book_dict["category"] = category
-            book_dict["rating"] = rating_dict
-
-            result.append(BookReadSimpleWithRating.model_validate(book_dict))
-
-        total_pages = (total_count + filter_params.size - 1) // filter_params.size if total_count > 0 else 0
-
-        return PaginatedResponse[BookReadSimpleWithRating](
-            data=result,
-            meta=PaginationMeta(
+                listing.with_window_total()
+        elif strategy == CountStrategy.CACHED:
+            total_count = await listing.cached_count(db, filter_params)
+        elif strategy == CountStrategy.ESTIMATE:
+            total_count, total_is_estimate = await listing.estimated_count(db)
+
+        # Cursor mode continues after the last seen row instead of skipping rows
+        if filter_params.cursor:
+            listing.after(filter_params.cursor)
+            offset = 0
+        else:
+            offset = (filter_params.page - 1) * filter_params.size
+        result, next_cursor = await listing.fetch_page(db, size=filter_params.size, offset=offset)
+
+        if listing.window_total:
+            total_count = listing.total
+            if total_count is None:
+                # No row carried the window count: empty listing, or a page past the end
+                total_count = await listing.count(db) if offset > 0 else 0
+
+        total_pages = None
+        if total_count is not None:
+            total_pages = (total_count + filter_params.size - 1) // filter_params.size if total_count > 0 else 0
+
+        return {
+            "data": result,
+            "meta": PaginationMeta(
                 total=total_count,
                 page=filter_params.page,
                 size=filter_params.size,
-                total_pages=total_pages
-            )
-        )
+                total_pages=total_pages,
+                next_cursor=next_cursor,
+                total_is_estimate=total_is_estimate
+            ).model_dump()
+        }
 
     @staticmethod
-    def get_book_by_id(book_id: int, db: Session) -> Optional[BookRead]:
-        book = db.query(Book).filter(Book.id == book_id).first()
-        if not book:
-            return None
+    async def get_book_detail(book_id: int, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """
+        Get a book with its author, category, active discount and rating in one statement
 
-        discount = DiscountService.get_current_discount_for_book(book_id, db)
-        author = AuthorService.get_author_by_id(book.author_id, db)
-        category = CategoryService.get_category_by_id(book.category_id, db)
+        Args:
+            book_id: ID of the book
+            db: Database session
 
-        review_count = db.query(func.count(Review.id))\
-            .filter(Review.book_id == book_id)\
-            .scalar() or 0
+        Returns:
+            JSON-ready dict shaped like BookRead, or None if the book does not exist
+        """
+        listing = BookListingQuery()
+        listing.stmt = listing.stmt.where(Book.id == book_id)
+        books = await listing.fetch_items(db, limit=1)
+        return books[0] if books else None
 
-        average_rating = ReviewService.get_average_rating_for_book(book_id, db)
+    @staticmethod
+    async def get_book_details(book_ids: List[int], db: AsyncSession) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several books with their author, category and active discount in one statement
 
-        rating_dict = {
-            "average_rating": average_rating.average_rating,
-            "review_count": review_count
-        }
+        Args:
+            book_ids: IDs of the books
+            db: Database session
+
+        Returns:
+            JSON-ready dicts shaped like BookRead keyed by book ID; missing books are left out
+        """
+        book_ids = list(set(book_ids))
+        if not book_ids:
+            return {}
 
-        book_dict = {**book.__dict__}
-        book_dict["discount"] = discount
-        book_dict["author"] = author
-        book_dict["category"] = category
-        book_dict["rating"] = rating_dict
+        listing = BookListingQuery()
+        listing.stmt = listing.stmt.where(Book.id.in_(book_ids))
+        books = await listing.fetch_items(db, limit=len(book_ids))
+        return {book["id"]: book for book in books}
 
-        return BookRead.model_validate(book_dict)
+    @staticmethod
+    async def book_exists(book_id: int, db: AsyncSession) -> bool:
+        """Cheap existence check, answered from memory for known books"""
+        return await BookExistenceService.exists(book_id, db)
+
+    @staticmethod
+    async def get_on_sale_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        """On sale: books with the biggest discount amount, served from memory"""
+        return await TopBooksService.get_on_sale_books(db)
 
     @staticmethod
-    def get_recommended_books(db: Session) -> List[BookReadSimpleWithRating]:
+    async def get_popular_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        """Popular: books with the most reviews, served from memory"""
+        return await TopBooksService.get_popular_books(db)
+
+    @staticmethod
+    async def get_recommended_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
         """
         Recommended: get top 8 books with highest average rating, and if multiple books have
         the same rating, sort by lowest final price
         """
-        today = date.today()
-        valid_discounts = (
-            db.query(
-                Discount.book_id,
-                func.min(Discount.discount_price).label("discount_price")
-            )
-            .filter(
-                or_(
-                    Discount.discount_end_date == None,
-                    Discount.discount_end_date > today
-                )
-            )
-            .group_by(Discount.book_id)
-            .subquery()
-        )
-
-        # Calculate final price for sorting - use the discount price directly if available
-        final_price = case(
-            (valid_discounts.c.discount_price.is_(None), Book.book_price),
-            else_=valid_discounts.c.discount_price
-        ).label("final_price")
-
-        # Get average rating and review count
-        avg_rating = func.coalesce(func.round(func.avg(Review.rating_star), 2), 0.0).label("avg_rating")
-        review_count = func.count(Review.id).label("review_count")
-
-        query_result = (
-            db.query(
-                Book,
-                avg_rating,
-                review_count,
-                final_price
-            )
-            .outerjoin(Review, Book.id == Review.book_id)
-            .outerjoin(valid_discounts, Book.id == valid_discounts.c.book_id)
-            .options(joinedload(Book.discounts))
-            .group_by(Book.id, valid_discounts.c.discount_price, Book.book_price)
-            # Sort by highest average rating first, then by lowest final price
-            .order_by(desc(avg_rating), final_price)
-            .limit(8)
-            .all()
-        )
-
-        result = []
-        for row in query_result:
-            book = row.Book
-            avg_rating = round(float(row.avg_rating), 2) if row.avg_rating is not None else 0.0
-            review_count = row.review_count
-            author = AuthorService.get_author_by_id(book.author_id, db)
-            category = CategoryService.get_category_by_id(book.category_id, db)
-
-            valid_book_discounts = [
-                d for d in book.discounts
-                if d.discount_end_date is None or d.discount_end_date > today
-            ]
-            valid_book_discounts.sort(key=lambda d: book.book_price - d.discount_price, reverse=True)
-
-            book_dict = book.__dict__.copy()
-            book_dict["discount"] = valid_book_discounts[0] if valid_book_discounts else None
-            book_dict["author"] = author
-            book_dict["category"] = category
-            rating_dict = {
-                "average_rating": avg_rating,
-                "review_count": review_count
-            }
-            book_dict["rating"] = rating_dict
-            result.append(BookReadSimpleWithRating.model_validate(book_dict))
-
-        return result
+        listing = BookListingQuery()
+        # Sort by highest average rating first, then by lowest final price
+        listing.stmt = listing.stmt.order_by(desc(listing.avg_rating), listing.final_price, Book.id)
+        return await listing.fetch(db, limit=8)
 
     @staticmethod
-    def get_reviews_by_book_id(book_id: int, filter_params: ReviewFilter, db: Session) -> PaginatedResponse[ReviewRead]:
-        query = db.query(Review).filter(Review.book_id == book_id)
+    async def get_reviews_by_book_id(book_id: int, filter_params: ReviewFilter, db: AsyncSession) -> PaginatedResponse[ReviewRead]:
+        query = select(Review).where(Review.book_id == book_id)
 
         if filter_params.rating_star is not None:
-            query = query.filter(Review.rating_star == filter_params.rating_star)
+            query = query.where(Review.rating_star == filter_params.rating_star)
 
+        # (column, descending) pairs, review id as a stable tiebreaker
+        sort_keys = []
         if filter_params.sort_by == ReviewSortField.DATE:
-            if filter_params.sort_direction == SortDirection.ASC:
-                query = query.order_by(Review.review_date.asc())
+            sort_keys.append((Review.review_date, filter_params.sort_direction != SortDirection.ASC))
+        sort_keys.append((Review.id, filter_params.sort_direction != SortDirection.ASC))
+        sort_name = f"{filter_params.sort_by}:{filter_params.sort_direction}"
+
+        query = query.order_by(*[desc(column) if descending else column for column, descending in sort_keys])
+
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+
+        # Cursor mode continues after the last seen review instead of skipping rows
+        total_count = None
+        if filter_params.cursor:
+            total_count = (await db.execute(count_query)).scalar() or 0
+            converters = [REVIEW_SORT_KEY_TYPES[column.key] for column, _ in sort_keys]
+            values = decode_cursor(filter_params.cursor, sort_name, converters)
+            query = query.where(keyset_condition(sort_keys, values))
+            offset = 0
+        else:
+            # The total comes with the page rows, computed before LIMIT/OFFSET
+            query = query.add_columns(func.count().over().label("total_count"))
+            offset = (filter_params.page - 1) * filter_params.size
+
+        rows = (await db.execute(query.offset(offset).limit(filter_params.size + 1))).all()
+        reviews = [row[0] for row in rows]
+
+        if total_count is None:
+            if rows:
+                total_count = rows[0].total_count
+            elif offset > 0:
+                # A page past the end carries no window count
+                total_count = (await db.execute(count_query)).scalar() or 0
             else:
-                query = query.order_by(Review.review_date.desc())
-
-        total_count = query.count()
+                total_count = 0
 
         total_pages = (total_count + filter_params.size - 1) // filter_params.size if total_count > 0 else 0
 
-        offset = (filter_params.page - 1) * filter_params.size
-        query = query.offset(offset).limit(filter_params.size)
-
-        reviews = query.all()
+        next_cursor = None
+        if len(reviews) > filter_params.size:
+            reviews = reviews[:filter_params.size]
+            next_cursor = encode_cursor(
+                sort_name,
+                [getattr(reviews[-1], column.key) for column, _ in sort_keys]
+            )
 
         review_data = []
         for review in reviews:
@@ -304,14 +223,38 @@ class BookService:
                 total=total_count,
                 total_pages=total_pages,
                 page=filter_params.page,
-                size=filter_params.size
+                size=filter_params.size,
+                next_cursor=next_cursor
             )
         )
         
     @staticmethod
-    def create_book(book_data: BookCreate, db: Session) -> BookRead:
+    async def create_book(book_data: BookCreate, db: AsyncSession) -> BookRead:
         book = Book(**book_data.model_dump())
+        # Read the author and category BookRead needs before the write, in one statement
+        author, category = await BookService.get_author_and_category(book.author_id, book.category_id, db)
         db.add(book)
-        db.commit()
-        db.refresh(book)
+        # The id comes back with the INSERT and nothing is expired on commit, no reload needed
+        await db.commit()
+        set_committed_value(book, "author", author)
+        set_committed_value(book, "category", category)
         return BookRead.model_validate(book)
+
+    @staticmethod
+    async def get_author_and_category(
+        author_id: Optional[int],
+        category_id: Optional[int],
+        db: AsyncSession
+    ) -> Tuple[Optional[Author], Optional[Category]]:
+        """
+        Load an author and a category by ID with one query
+
+        Returns:
+            Tuple of (author, category), None for IDs not given or not found
+        """
+        author = aliased(Author, select(Author).where(Author.id == author_id).subquery())
+        category = aliased(Category, select(Category).where(Category.id == category_id).subquery())
+        # Full join on true: one row holding whichever of the two exists
+        stmt = select(author, category).select_from(author).join(category, true(), full=True)
+        row = (await db.execute(stmt)).first()
+        return (row[0], row[1]) if row else (None, None)
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v1.services.catalog_events import CatalogEvents, BOOK
+from models.book import Book
+
+
+class BookExistenceService:
+    """
+    Answers "does this book exist" from an in-memory bitmap of book ids.
+
+    The bitmap is loaded with one query on first use. Ids missing from it are
+    checked by primary key and added when found, which picks up books created
+    by other workers. Committed book changes clear their bits, so a deleted
+    book goes back to the primary key check.
+    """
+
+    _bits: Optional[bytearray] = None
+    _load_lock = asyncio.Lock()
+
+    @staticmethod
+    async def exists(book_id: int, db: AsyncSession) -> bool:
+        if book_id <= 0:
+            return False
+
+        if BookExistenceService._bits is None:
+            await BookExistenceService.load(db)
+        if BookExistenceService._is_set(book_id):
+            return True
+
+        found = (await db.execute(select(Book.id).where(Book.id == book_id))).first() is not None
+        if found:
+            BookExistenceService._set(book_id)
+        return found
+
+    @staticmethod
+    async def load(db: AsyncSession) -> None:
+        """Load the ids of all books into the bitmap"""
+        async with BookExistenceService._load_lock:
+            if BookExistenceService._bits is not None:
+                return
+            book_ids = (await db.execute(select(Book.id))).scalars().all()
+            bits = bytearray((max(book_ids, default=0) >> 3) + 1)
+            for book_id in book_ids:
+                bits[book_id >> 3] |= 1 << (book_id & 7)
+            BookExistenceService._bits = bits
+
+    @staticmethod
+    def invalidate(changes: Dict[str, Set[int]]) -> None:
+        for book_id in changes.get(BOOK, ()):
+            BookExistenceService._clear(book_id)
+
+    @staticmethod
+    def _is_set(book_id: int) -> bool:
+        bits = BookExistenceService._bits
+        index = book_id >> 3
+        return index < len(bits) and bool(bits[index] & (1 << (book_id & 7)))
+
+    @staticmethod
+    def _set(book_id: int) -> None:
+        bits = BookExistenceService._bits
+        index = book_id >> 3
+        if index >= len(bits):
+            bits.extend(bytes(index - len(bits) + 1))
+        bits[index] |= 1 << (book_id & 7)
+
+    @staticmethod
+    def _clear(book_id: int) -> None:
+        bits = BookExistenceService._bits
+        if bits is not None and (book_id >> 3) < len(bits):
+            bits[book_id >> 3] &= ~(1 << (book_id & 7)) & 0xFF
+
+
+CatalogEvents.subscribe(BookExistenceService.invalidate)
@@ -0,0 +1,311 @@
+import os
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
+from sqlalchemy.sql import Select
+from typing import Any, Dict, List, Optional, Tuple
+from decimal import Decimal
+
+from api.v1.schemas.book import BookReadSimpleWithRating
+from api.v1.schemas.query import BookFilter, BookSortField, SortDirection
+from api.v1.services.book_search import BookSearchService
+from api.v1.services.book_stats import BookStatsService
+from api.v1.services.cache import response_cache, BOOK_COUNTS
+from api.v1.services.effective_price import EffectivePriceService
+from api.v1.utils.pagination import encode_cursor, decode_cursor, keyset_condition
+from models.book import Book
+from models.book_effective_price import BookEffectivePrice
+from models.author import Author
+from models.category import Category
+from models.discount import Discount
+from models.book_stats import BookStats
+from models.book_search import BookSearch
+
+# Value types of the listing sort keys, used to restore cursor values
+SORT_KEY_TYPES = {
+    "id": int,
+    "sub_price": Decimal,
+    "final_price": Decimal,
+    "review_count": int,
+    "rank": float,
+}
+
+# The estimate strategy runs an exact count when the planner expects fewer rows
+COUNT_ESTIMATE_EXACT_BELOW = int(os.getenv("COUNT_ESTIMATE_EXACT_BELOW", 1000))
+
+
+class BookListingQuery:
+    """
+    Single-statement listing of books joined with their author, category,
+    precomputed effective price (with its active discount) and review stats.
+
+    Exposes the computed columns so callers can filter and sort on them.
+    """
+
+    def __init__(self):
+        self.final_price = BookEffectivePrice.final_price
+        self.sub_price = BookEffectivePrice.discount_amount
+        self.review_count = func.coalesce(BookStats.review_count, 0)
+        self.avg_rating = func.coalesce(BookStatsService.average_rating(), 0)
+        # Relevance of each book, set by search()
+        self.rank = None
+
+        # (row attribute, column expression, descending) in ORDER BY order
+        self.sort_keys = [("id", Book.id, False)]
+        self.sort_name = "id"
+
+        # Set by fetch_page when the statement carries a window count
+        self.window_total = False
+        self.total: Optional[int] = None
+
+        self.stmt: Select = (
+            select(
+                Book.id,
+                Book.book_title,
+                Book.book_summary,
+                Book.book_price,
+                Book.book_cover_photo,
+                Author.id.label("author_id"),
+                Author.author_name,
+                Author.author_bio,
+                Category.id.label("category_id"),
+                Category.category_name,
+                Category.category_desc,
+                Discount.id.label("discount_id"),
+                Discount.discount_start_date,
+                Discount.discount_end_date,
+                Discount.discount_price,
+                self.review_count.label("review_count"),
+                self.avg_rating.label("avg_rating"),
+                self.sub_price.label("sub_price"),
+                self.final_price.label("final_price")
+            )
+            .select_from(Book)
+            .join(BookEffectivePrice, BookEffectivePrice.book_id == Book.id)
+            .outerjoin(Discount, Discount.id == BookEffectivePrice.discount_id)
+            .outerjoin(Author, Author.id == Book.author_id)
+            .outerjoin(Category, Category.id == Book.category_id)
+            .outerjoin(BookStats, BookStats.book_id == Book.id)
+        )
+
+    def filter(self, filter_params: BookFilter) -> "BookListingQuery":
+        """Apply category, author and rating filters from a BookFilter"""
+        if filter_params.category_id is not None:
+            self.stmt = self.stmt.where(Book.category_id == filter_params.category_id)
+
+        if filter_params.author_id is not None:
+            self.stmt = self.stmt.where(Book.author_id == filter_params.author_id)
+
+        if filter_params.rating_star is not None:
+            # Filter books with average rating >= rating_star
+            self.stmt = self.stmt.where(self.avg_rating >= filter_params.rating_star)
+
+        if getattr(filter_params, "q", None):
+            self.search(filter_params.q)
+
+        return self
+
+    def search(self, q: str) -> "BookListingQuery":
+        """
+        Keep the books whose search document matches q and rank them
+
+        The GIN index on book_search finds the matches, so the cost depends
+        on the number of matching books rather than on the catalog size.
+        """
+        tsquery = BookSearchService.query(q)
+        self.rank = BookSearchService.rank(tsquery)
+        self.stmt = (
+            self.stmt
+            .add_columns(self.rank.label("rank"))
+            .join(BookSearch, BookSearch.book_id == Book.id)
+            .where(BookSearchService.matches(tsquery))
+        )
+        return self
+
+    def sort(self, sort_by: Optional[str], sort_direction: Optional[str]) -> "BookListingQuery":
+        """
+        Apply BookFilter sorting, using the book id as a stable tiebreaker
+
+        The keys match the book_effective_price indexes, so the ON_SALE and
+        PRICE sorts can be served by an index scan.
+        """
+        descending = sort_direction == SortDirection.DESC
+        book_id = BookEffectivePrice.book_id
+
+        if sort_by == BookSortField.ON_SALE:
+            # Sort by sub price and then by final price (asc)
+            self.sort_keys = [
+                ("sub_price", self.sub_price, descending),
+                ("final_price", self.final_price, False),
+                ("id", book_id, False)
+            ]
+        elif sort_by == BookSortField.POPULARITY:
+            # Sort by review count and then by final price (asc)
+            self.sort_keys = [
+                ("review_count", self.review_count, descending),
+                ("final_price", self.final_price, False),
+                ("id", book_id, False)
+            ]
+        elif sort_by == BookSortField.PRICE:
+            # The tiebreaker follows the price direction so one index serves both
+            self.sort_keys = [("final_price", self.final_price, descending), ("id", book_id, descending)]
+        elif sort_by is None and self.rank is not None:
+            # Search results default to the most relevant first
+            self.sort_keys = [("rank", self.rank, True), ("id", book_id, False)]
+        else:
+            self.sort_keys = [("id", book_id, False)]
+
+        self.sort_name = f"{sort_by}:{sort_direction}"
+        self.stmt = self.stmt.order_by(
+            *[desc(column) if descending else column for _, column, descending in self.sort_keys]
+        )
+        return self
+
+    def after(self, cursor: str) -> "BookListingQuery":
+        """
+        Continue the listing after the row encoded in the cursor
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another sort
+        """
+        converters = [SORT_KEY_TYPES[name] for name, _, _ in self.sort_keys]
+        values = decode_cursor(cursor, self.sort_name, converters)
+        keys = [(column, descending) for _, column, descending in self.sort_keys]
+        self.stmt = self.stmt.where(keyset_condition(keys, values))
+        return self
+
+    def with_window_total(self) -> "BookListingQuery":
+        """
+        Return the number of matching books with every row (COUNT(*) OVER()),
+        so one round trip gives both the page and the total
+
+        Must be called before after(), the window only sees rows past the cursor.
+        """
+        self.stmt = self.stmt.add_columns(func.count().over().label("total_count"))
+        self.window_total = True
+        return self
+
+    async def count(self, db: AsyncSession) -> int:
+        """Count the books matching the current filters"""
+        await EffectivePriceService.ensure_current(db)
+        count_stmt = select(func.count()).select_from(
+            self.stmt.order_by(None).with_only_columns(Book.id).subquery()
+        )
+        return (await db.execute(count_stmt)).scalar() or 0
+
+    async def cached_count(self, db: AsyncSession, filter_params: BookFilter) -> int:
+        """Exact count cached per filter until books or reviews change"""
+        filters = filter_params.model_dump(include={"category_id", "author_id", "rating_star"})
+        # Search counts must not share entries with the catalog listing
+        filters["q"] = getattr(filter_params, "q", None)
+        return await response_cache.aget_or_set(BOOK_COUNTS, filters, lambda: self.count(db))
+
+    async def estimated_count(self, db: AsyncSession) -> Tuple[int, bool]:
+        """
+        Planner row estimate of the books matching the current filters
+
+        Returns:
+            Tuple of (count, whether it is an estimate); small results are counted exactly
+        """
+        stmt = self.stmt.order_by(None).with_only_columns(Book.id)
+        connection = await db.connection()
+        compiled = stmt.compile(dialect=connection.dialect)
+        plan = (await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        )).scalar()
+
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < COUNT_ESTIMATE_EXACT_BELOW:
+            return await self.count(db), False
+        return estimate, True
+
+    async def fetch(self, db: AsyncSession, limit: int, offset: int = 0) -> List[BookReadSimpleWithRating]:
+        """Execute the listing statement and build the response rows"""
+        return [BookReadSimpleWithRating.model_validate(item) for item in await self.fetch_items(db, limit, offset)]
+
+    async def fetch_items(self, db: AsyncSession, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Execute the listing statement and build JSON-ready rows with to_item"""
+        await EffectivePriceService.ensure_current(db)
+        rows = (await db.execute(self.stmt.offset(offset).limit(limit))).all()
+        return [BookListingQuery.to_item(row) for row in rows]
+
+    async def fetch_page(self, db: AsyncSession, size: int, offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Execute the listing statement for one page
+
+        Returns:
+            Tuple of (books as JSON-ready dicts from to_item, cursor for the next page or None on the last page)
+        """
+        await EffectivePriceService.ensure_current(db)
+        rows = (await db.execute(self.stmt.offset(offset).limit(size + 1))).all()
+
+        if self.window_total and rows:
+            self.total = rows[0].total_count
+
+        next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                self.sort_name,
+                [getattr(last, name) for name, _, _ in self.sort_keys]
+            )
+
+        return [BookListingQuery.to_item(row) for row in rows], next_cursor
+
+    @staticmethod
+    def to_book(row) -> BookReadSimpleWithRating:
+        """Build a validated listing item from a row of the listing statement"""
+        return BookReadSimpleWithRating.model_validate(BookListingQuery.to_item(row))
+
+    @staticmethod
+    def to_item(row) -> Dict[str, Any]:
+        """
+        Build a listing item from a row of the listing statement, shaped like
+        BookReadSimpleWithRating but without validation
+
+        The row comes straight from the database, so the types are already known.
+        """
+        author = None
+        if row.author_id is not None:
+            author = {
+                "id": row.author_id,
+                "author_name": row.author_name,
+                "author_bio": row.author_bio
+            }
+
+        category = None
+        if row.category_id is not None:
+            category = {
+                "id": row.category_id,
+                "category_name": row.category_name,
+                "category_desc": row.category_desc
+            }
+
+        discount = None
+        if row.discount_id is not None:
+            discount = {
+                "id": row.discount_id,
+                "book_id": row.id,
+                "discount_start_date": row.discount_start_date,
+                "discount_end_date": row.discount_end_date,
+                "discount_price": _to_float(row.discount_price)
+            }
+
+        avg_rating = round(float(row.avg_rating), 2) if row.avg_rating is not None else 0.0
+
+        return {
+            "book_title": row.book_title,
+            "book_summary": row.book_summary,
+            "book_price": _to_float(row.book_price),
+            "book_cover_photo": row.book_cover_photo,
+            "id": row.id,
+            "category": category,
+            "author": author,
+            "discount": discount,
+            "rating": {"review_count": row.review_count, "average_rating": avg_rating}
+        }
+
+
+def _to_float(value: Optional[Decimal]) -> Optional[float]:
+    return float(value) if value is not None else None
@@ -0,0 +1,113 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, event, inspect, literal_column, cast
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.author import Author
+from models.book import Book
+from models.book_search import BookSearch
+
+# Text search configuration used for documents and queries
+SEARCH_CONFIG = "english"
+
+
+class BookSearchService:
+    """
+    Keeps book_search in sync with book titles, summaries and author names,
+    and builds the matching and ranking expressions for search queries.
+    """
+
+    @staticmethod
+    def document():
+        """SQL expression for the weighted document of a Book row joined with its Author"""
+        def weighted(text, weight):
+            # Inline the weight, setweight takes a "char" and a bound varchar would not match
+            return func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(text, "")), literal_column(f"'{weight}'"))
+
+        return (
+            weighted(Book.book_title, "A")
+            .op("||")(weighted(Author.author_name, "B"))
+            .op("||")(weighted(Book.book_summary, "C"))
+        )
+
+    @staticmethod
+    def query(q: str):
+        """Parse user input with web search syntax: quoted phrases, OR and -negation"""
+        return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    @staticmethod
+    def matches(tsquery):
+        return BookSearch.document.bool_op("@@")(tsquery)
+
+    @staticmethod
+    def rank(tsquery):
+        # ts_rank returns real; widen it in SQL so cursor values round-trip exactly
+        return cast(func.ts_rank(BookSearch.document, tsquery), DOUBLE_PRECISION)
+
+    @staticmethod
+    def refresh_statement(book_filter=None):
+        """
+        Build the upsert recomputing the documents of the books matching book_filter
+
+        Args:
+            book_filter: Optional WHERE condition on Book, all books when omitted
+
+        Returns:
+            INSERT ... SELECT ... ON CONFLICT DO UPDATE statement
+        """
+        source = (
+            select(Book.id, BookSearchService.document())
+            .select_from(Book)
+            .outerjoin(Author, Author.id == Book.author_id)
+        )
+        if book_filter is not None:
+            source = source.where(book_filter)
+
+        stmt = pg_insert(BookSearch).from_select(["book_id", "document"], source)
+        return stmt.on_conflict_do_update(
+            index_elements=[BookSearch.book_id],
+            set_={"document": stmt.excluded.document}
+        )
+
+    @staticmethod
+    def refresh_books(book_ids: Iterable[int], connection: Connection) -> None:
+        """Recompute the documents of the given books in the caller's transaction"""
+        book_ids = [book_id for book_id in set(book_ids) if book_id is not None]
+        if book_ids:
+            connection.execute(BookSearchService.refresh_statement(Book.id.in_(book_ids)))
+
+    @staticmethod
+    def refresh_all(db: Session) -> int:
+        """
+        Recompute the document of every book
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of refreshed books
+        """
+        result = db.execute(BookSearchService.refresh_statement())
+        db.commit()
+        return result.rowcount
+
+
+@event.listens_for(Book, "after_insert")
+def _book_inserted(mapper, connection, target):
+    BookSearchService.refresh_books([target.id], connection)
+
+
+@event.listens_for(Book, "after_update")
+def _book_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in ("book_title", "book_summary", "author_id")):
+        BookSearchService.refresh_books([target.id], connection)
+
+
+@event.listens_for(Author, "after_update")
+def _author_updated(mapper, connection, target):
+    if inspect(target).attrs.author_name.history.has_changes():
+        connection.execute(BookSearchService.refresh_statement(Book.author_id == target.id))
@@ -0,0 +1,93 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, cast, Numeric, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Optional
+
+from models.book_stats import BookStats
+from models.review import Review
+
+STAR_COLUMNS = ["star_1", "star_2", "star_3", "star_4", "star_5"]
+
+
+class BookStatsService:
+    @staticmethod
+    def rated_count():
+        """SQL expression for the number of reviews that carry a star rating"""
+        return (
+            BookStats.star_1 + BookStats.star_2 + BookStats.star_3
+            + BookStats.star_4 + BookStats.star_5
+        )
+
+    @staticmethod
+    def average_rating():
+        """SQL expression for the average star rating rounded to 2 decimals, NULL without ratings"""
+        return func.round(
+            cast(BookStats.rating_sum, Numeric) / func.nullif(BookStatsService.rated_count(), 0),
+            2
+        )
+
+    @staticmethod
+    async def record_review(book_id: int, rating_star: Optional[int], db: AsyncSession) -> None:
+        """
+        Add a new review to the stats of its book
+
+        Runs in the caller's transaction, the caller is responsible for committing.
+
+        Args:
+            book_id: ID of the reviewed book
+            rating_star: Star rating of the review, if any
+            db: Database session
+        """
+        values = {"book_id": book_id, "review_count": 1, "rating_sum": rating_star or 0}
+        for star, column in enumerate(STAR_COLUMNS, start=1):
+            values[column] = 1 if rating_star == star else 0
+
+        stmt = pg_insert(BookStats).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BookStats.book_id],
+            set_={
+                column: getattr(BookStats, column) + getattr(stmt.excluded, column)
+                for column in values if column != "book_id"
+            }
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Recompute all book stats from the review table
+
+        Blocks concurrent review writes on book_stats until the rebuild commits,
+        so no increment is lost or counted twice.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of books with stats
+        """
+        db.execute(text("LOCK TABLE book_stats IN SHARE ROW EXCLUSIVE MODE"))
+        db.execute(delete(BookStats))
+
+        aggregates = (
+            select(
+                Review.book_id,
+                func.count(Review.id),
+                func.coalesce(func.sum(Review.rating_star), 0),
+                *[
+                    func.count(Review.id).filter(Review.rating_star == star)
+                    for star in range(1, 6)
+                ]
+            )
+            .where(Review.book_id.is_not(None))
+            .group_by(Review.book_id)
+        )
+        result = db.execute(
+            insert(BookStats).from_select(
+                ["book_id", "review_count", "rating_sum", *STAR_COLUMNS],
+                aggregates
+            )
+        )
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,290 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.logger import logger
+from pydantic import BaseModel
+
+from api.v1.services.catalog_events import CatalogEvents, AUTHOR, BOOK, CATEGORY, DISCOUNT, REVIEW
+
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 60))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2048))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+# Cache namespaces
+AUTHORS = "authors"
+BOOKS = "books"
+BOOK_COUNTS = "book_counts"
+CATEGORIES = "categories"
+RECOMMENDED = "recommended"
+
+# Data versions, bumped like namespaces and used for HTTP ETags
+CATALOG_VERSION = "version:catalog"
+REVIEWS_VERSION = "version:reviews"
+
+
+def book_namespace(book_id: int) -> str:
+    return f"book:{book_id}"
+
+
+def reviews_namespace(book_id: int) -> str:
+    return f"reviews:{book_id}"
+
+
+class LocalCacheBackend:
+    """In-process LRU cache with per-entry TTL"""
+
+    name = "local"
+    blocking = False
+    # Invalidations only reach this process
+    shared = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Generations restart at 0 with the process, the epoch tells them apart
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers, stored in Redis"""
+
+    name = "redis"
+    # Network calls, run them off the event loop in async code
+    blocking = True
+    shared = True
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        # Shared by all workers, changes only if Redis loses its data
+        self._client.set("gen:epoch", uuid.uuid4().hex[:8], nx=True)
+        self.epoch = self._client.get("gen:epoch").decode()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._client.get(key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._client.setex(key, ttl, json.dumps(value))
+
+    def generation(self, namespace: str) -> int:
+        return int(self._client.get(f"gen:{namespace}") or 0)
+
+    def bump(self, namespace: str) -> None:
+        self._client.incr(f"gen:{namespace}")
+
+    def size(self) -> int:
+        return self._client.dbsize()
+
+
+class ResponseCache:
+    """
+    Caches read endpoint results keyed on namespace and normalized query parameters.
+
+    Invalidation bumps a namespace generation, which is part of every key, so
+    all entries of that namespace are dropped at once on any backend. Values
+    are stored JSON-encoded so local and shared backends are interchangeable.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def from_env() -> "ResponseCache":
+        backend = LocalCacheBackend(CACHE_MAX_ENTRIES)
+        if CACHE_REDIS_URL:
+            try:
+                backend = RedisCacheBackend(CACHE_REDIS_URL)
+            except ImportError:
+                logger.warning("CACHE_REDIS_URL is set but the redis package is not installed, using the local cache")
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable ({e}), using the local cache")
+        return ResponseCache(backend, CACHE_TTL_SECONDS)
+
+    @staticmethod
+    def normalize(params: Any) -> str:
+        """Stable key for query parameters: filter models, dicts or scalars"""
+        if isinstance(params, BaseModel):
+            params = params.model_dump(exclude_none=True)
+        payload = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def key(self, namespace: str, params: Any = None) -> str:
+        return f"{namespace}:{self.backend.generation(namespace)}:{self.normalize(params)}"
+
+    def get_or_set(self, namespace: str, params: Any, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for namespace and params, loading and storing it on a miss
+
+        Args:
+            namespace: Cache namespace, used for invalidation and stats
+            params: Query parameters the value depends on
+            loader: Produces the value on a miss; exceptions are not cached
+
+        Returns:
+            JSON-compatible value
+        """
+        stats_name = namespace.split(":", 1)[0]
+        try:
+            key = self.key(namespace, params)
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            key, value = None, None
+
+        if value is not None:
+            self._hits[stats_name] += 1
+            return value
+
+        self._misses[stats_name] += 1
+        value = jsonable_encoder(loader())
+
+        if key is not None:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception as e:
+                logger.warning(f"Cache write failed: {e}")
+        return value
+
+    async def aget_or_set(self, namespace: str, params: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of get_or_set for coroutine loaders"""
+        stats_name = namespace.split(":", 1)[0]
+        try:
+            key = await self._call_backend(self.key, namespace, params)
+            value = await self._call_backend(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            key, value = None, None
+
+        if value is not None:
+            self._hits[stats_name] += 1
+            return value
+
+        self._misses[stats_name] += 1
+        value = jsonable_encoder(await loader())
+
+        if key is not None:
+            try:
+                await self._call_backend(self.backend.set, key, value, self.ttl)
+            except Exception as e:
+                logger.warning(f"Cache write failed: {e}")
+        return value
+
+    async def version(self, namespaces: Iterable[str]) -> str:
+        """
+        Opaque stamp that changes whenever one of the namespaces is invalidated
+
+        Other workers do not see the invalidations of a process-local backend,
+        so its stamps also change every TTL, like its cached values expire.
+        """
+        generations = [str(await self._call_backend(self.backend.generation, namespace)) for namespace in namespaces]
+        if not self.backend.shared:
+            generations.append(str(int(time.time() // self.ttl)))
+        return ":".join([self.backend.epoch, *generations])
+
+    async def _call_backend(self, function: Callable, *args) -> Any:
+        # Keep network round trips of shared backends off the event loop
+        if self.backend.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    def invalidate(self, namespaces: Iterable[str]) -> None:
+        for namespace in namespaces:
+            try:
+                self.backend.bump(namespace)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+
+    def invalidate_changes(self, changes: Dict[str, Set[int]]) -> None:
+        """
+        Invalidate the namespaces affected by committed catalog changes
+
+        Book details embedding a changed author or category expire with the TTL.
+        """
+        namespaces = set()
+
+        if changes.keys() & {BOOK, DISCOUNT, REVIEW, AUTHOR, CATEGORY}:
+            # Listings embed prices, ratings, authors and categories
+            namespaces.update({BOOKS, RECOMMENDED})
+        if changes.keys() & {BOOK, REVIEW}:
+            # Listing totals depend on book filters and average ratings
+            namespaces.add(BOOK_COUNTS)
+        if changes.keys() & {BOOK, DISCOUNT, AUTHOR, CATEGORY}:
+            namespaces.add(CATALOG_VERSION)
+        if REVIEW in changes:
+            namespaces.add(REVIEWS_VERSION)
+        if AUTHOR in changes:
+            namespaces.add(AUTHORS)
+        if CATEGORY in changes:
+            namespaces.add(CATEGORIES)
+
+        for kind in (BOOK, DISCOUNT, REVIEW):
+            for book_id in changes.get(kind, ()):
+                namespaces.add(book_namespace(book_id))
+                if kind == REVIEW:
+                    namespaces.add(reviews_namespace(book_id))
+
+        self.invalidate(namespaces)
+
+    def stats(self) -> dict:
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        result = {}
+        for namespace in namespaces:
+            hits, misses = self._hits[namespace], self._misses[namespace]
+            result[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+            }
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl,
+            "entries": self.backend.size(),
+            "namespaces": result
+        }
+
+
+response_cache = ResponseCache.from_env()
+CatalogEvents.subscribe(response_cache.invalidate_changes)
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set
+
+from fastapi.logger import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from models.author import Author
+from models.book import Book
+from models.category import Category
+from models.discount import Discount
+from models.review import Review
+
+# Kinds of catalog changes
+AUTHOR = "author"
+BOOK = "book"
+CATEGORY = "category"
+DISCOUNT = "discount"
+REVIEW = "review"
+
+_SESSION_KEY = "catalog_changes"
+
+
+class CatalogEvents:
+    """
+    Publishes catalog writes (authors, categories, books, discounts, reviews)
+    once they are committed.
+
+    ORM writes are recorded automatically through mapper events; code writing
+    with Core statements calls CatalogEvents.record itself. Subscribers receive
+    a dict of change kind to affected ids after the transaction commits,
+    so caches never reload data that is not visible yet.
+    """
+
+    _subscribers: List[Callable[[Dict[str, Set[int]]], None]] = []
+
+    @staticmethod
+    def subscribe(callback: Callable[[Dict[str, Set[int]]], None]) -> None:
+        CatalogEvents._subscribers.append(callback)
+
+    @staticmethod
+    def record(db: Session, kind: str, ids: Iterable[int]) -> None:
+        """
+        Record a change to publish when the session commits
+
+        Args:
+            db: Session the change was written with
+            kind: AUTHOR, CATEGORY or BOOK with the changed row ids,
+                DISCOUNT or REVIEW with the ids of the affected books
+            ids: Affected ids
+        """
+        changes = db.info.setdefault(_SESSION_KEY, defaultdict(set))
+        changes[kind].update(id for id in ids if id is not None)
+
+    @staticmethod
+    def publish(changes: Dict[str, Set[int]]) -> None:
+        for callback in CatalogEvents._subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.warning(f"Catalog change subscriber failed: {e}")
+
+
+def _record_change(kind: str, id_attribute: str):
+    def listener(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            CatalogEvents.record(session, kind, [getattr(target, id_attribute)])
+    return listener
+
+
+for _model, _kind, _id_attribute in (
+    (Author, AUTHOR, "id"),
+    (Category, CATEGORY, "id"),
+    (Book, BOOK, "id"),
+    (Discount, DISCOUNT, "book_id"),
+    (Review, REVIEW, "book_id"),
+):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _record_change(_kind, _id_attribute))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    changes = session.info.pop(_SESSION_KEY, None)
+    if changes:
+        CatalogEvents.publish(dict(changes))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_SESSION_KEY, None)
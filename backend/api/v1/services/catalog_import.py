@@ -0,0 +1,242 @@
+import csv
+import io
+import json
+import os
+from collections import defaultdict
+from typing import IO, Dict, Iterable, Iterator, List, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from api.v1.schemas.catalog_import import (
+    AuthorImportRow,
+    BookImportRow,
+    CategoryImportRow,
+    DiscountImportRow,
+    ImportFormat,
+    ImportKind,
+    ImportRejectedRow,
+    ImportReport
+)
+from api.v1.services.book_search import BookSearchService
+from api.v1.services.catalog_events import CatalogEvents, AUTHOR, BOOK, CATEGORY, DISCOUNT
+from api.v1.services.effective_price import EffectivePriceService
+from models.author import Author
+from models.book import Book
+from models.category import Category
+from models.discount import Discount
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+# Rejected rows listed in the report, the count is always complete
+MAX_REPORTED_REJECTIONS = 1000
+
+_STAGING = "import_staging"
+
+
+class _ImportTarget:
+    def __init__(self, model, row_schema: Type[BaseModel], foreign_keys: Dict[str, str], event_kind: str, event_id: str):
+        self.table = model.__table__
+        self.row_schema = row_schema
+        self.columns = list(row_schema.model_fields)
+        # Column -> referenced table
+        self.foreign_keys = foreign_keys
+        # Catalog change published for the imported rows, with the column holding its id
+        self.event_kind = event_kind
+        self.event_id = event_id
+
+
+IMPORT_TARGETS = {
+    ImportKind.AUTHORS: _ImportTarget(Author, AuthorImportRow, {}, AUTHOR, "id"),
+    ImportKind.CATEGORIES: _ImportTarget(Category, CategoryImportRow, {}, CATEGORY, "id"),
+    ImportKind.BOOKS: _ImportTarget(Book, BookImportRow, {"author_id": "author", "category_id": "category"}, BOOK, "id"),
+    ImportKind.DISCOUNTS: _ImportTarget(Discount, DiscountImportRow, {"book_id": "book"}, DISCOUNT, "book_id"),
+}
+
+
+class CatalogImportService:
+    """
+    Bulk loads catalog rows with COPY.
+
+    Rows are validated one by one, then copied in chunks into a temporary
+    staging table, where ids that already exist and references to missing
+    rows are rejected before the rest is inserted into the catalog table.
+    The whole import is one transaction, and caches are invalidated once
+    after it commits, instead of once per row.
+    """
+
+    @staticmethod
+    def read_rows(stream: IO[bytes], file_format: ImportFormat) -> Iterator[Tuple[int, object]]:
+        """
+        Parse an import file lazily
+
+        Args:
+            stream: Binary file object, UTF-8 encoded
+            file_format: CSV with a header row, or NDJSON
+
+        Returns:
+            Iterator of (line number, parsed row); malformed NDJSON lines are
+            returned as strings so they are rejected by validation
+        """
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        if file_format == ImportFormat.CSV:
+            reader = csv.DictReader(text_stream)
+            for row in reader:
+                # Empty CSV cells are missing values
+                yield reader.line_num, {key: value if value != "" else None for key, value in row.items()}
+            return
+
+        for line_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, line
+
+    @staticmethod
+    def import_rows(kind: ImportKind, rows: Iterable[Tuple[int, object]], db: Session) -> ImportReport:
+        """
+        Validate and insert rows of one entity kind
+
+        Args:
+            kind: Entity kind of the rows
+            rows: (line number, row) pairs, e.g. from read_rows
+            db: Database session, committed at the end
+
+        Returns:
+            ImportReport with the imported count and the rejected rows
+        """
+        target = IMPORT_TARGETS[kind]
+        connection = db.connection()
+        CatalogImportService._create_staging(target, connection)
+
+        received = 0
+        rejected: List[ImportRejectedRow] = []
+        imported_ids: Set[int] = set()
+
+        chunk: List[tuple] = []
+        for line, raw in rows:
+            received += 1
+            try:
+                if not isinstance(raw, dict):
+                    raise ValueError("Row is not a JSON object")
+                row = target.row_schema.model_validate(raw)
+            except (ValidationError, ValueError) as e:
+                rejected.append(ImportRejectedRow(line=line, errors=CatalogImportService._errors(e)))
+                continue
+
+            chunk.append((line, *[getattr(row, column) for column in target.columns]))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                CatalogImportService._load_chunk(target, chunk, connection, rejected, imported_ids)
+                chunk = []
+
+        if chunk:
+            CatalogImportService._load_chunk(target, chunk, connection, rejected, imported_ids)
+
+        db.commit()
+        if imported_ids:
+            CatalogEvents.publish({target.event_kind: imported_ids})
+
+        rejected.sort(key=lambda row: row.line)
+        return ImportReport(
+            kind=kind,
+            received=received,
+            imported=received - len(rejected),
+            rejected=len(rejected),
+            rejected_rows=rejected[:MAX_REPORTED_REJECTIONS]
+        )
+
+    @staticmethod
+    def _create_staging(target: _ImportTarget, connection: Connection) -> None:
+        columns = ", ".join(
+            f'"{column}" {target.table.c[column].type.compile(dialect=connection.dialect)}'
+            for column in target.columns
+        )
+        connection.execute(text(f"DROP TABLE IF EXISTS {_STAGING}"))
+        connection.execute(text(f"CREATE TEMP TABLE {_STAGING} (line INTEGER, {columns}) ON COMMIT DROP"))
+
+    @staticmethod
+    def _load_chunk(
+        target: _ImportTarget,
+        chunk: List[tuple],
+        connection: Connection,
+        rejected: List[ImportRejectedRow],
+        imported_ids: Set[int]
+    ) -> None:
+        columns = ", ".join(f'"{column}"' for column in target.columns)
+        # COPY through the driver connection, in the transaction of the session
+        with connection.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY {_STAGING} (line, {columns}) FROM STDIN") as copy:
+                for row in chunk:
+                    copy.write_row(row)
+
+        errors = CatalogImportService._check_staged_rows(target, connection)
+        if errors:
+            connection.execute(text(f"DELETE FROM {_STAGING} WHERE line = ANY(:lines)"), {"lines": list(errors)})
+            rejected.extend(ImportRejectedRow(line=line, errors=messages) for line, messages in errors.items())
+
+        table = target.table.name
+        # Move the id sequence past the ids given in the file before generating any,
+        # so generated ids never collide with explicit ones; it never moves back
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), s.max_id) "
+            f"FROM (SELECT max(id) AS max_id FROM {_STAGING}) s "
+            f"WHERE s.max_id > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('{table}', 'id')::regclass), 0)"
+        ))
+
+        values = ", ".join(f's."{column}"' for column in target.columns if column != "id")
+        inserted = connection.execute(text(
+            f'INSERT INTO "{table}" ({columns}) '
+            f"SELECT COALESCE(s.id, nextval(pg_get_serial_sequence('{table}', 'id'))), {values} "
+            f"FROM {_STAGING} s ORDER BY s.line "
+            f'RETURNING "{target.event_id}"'
+        )).scalars().all()
+        connection.execute(text(f"TRUNCATE {_STAGING}"))
+
+        changed = {value for value in inserted if value is not None}
+        imported_ids.update(changed)
+        # Core inserts skip the mapper events maintaining the read projections
+        if target.event_kind in (BOOK, DISCOUNT):
+            EffectivePriceService.refresh_books(changed, connection)
+        if target.event_kind == BOOK:
+            BookSearchService.refresh_books(changed, connection)
+
+    @staticmethod
+    def _check_staged_rows(target: _ImportTarget, connection: Connection) -> Dict[int, List[str]]:
+        """Lines of the staged rows that cannot be inserted, with the reasons"""
+        errors: Dict[int, List[str]] = defaultdict(list)
+        table = target.table.name
+
+        duplicates = connection.execute(text(
+            f"SELECT line, id FROM (SELECT line, id, row_number() OVER (PARTITION BY id ORDER BY line) AS n "
+            f"FROM {_STAGING} WHERE id IS NOT NULL) staged WHERE n > 1"
+        ))
+        for line, id in duplicates:
+            errors[line].append(f"id {id} appears earlier in the file")
+
+        existing = connection.execute(text(
+            f'SELECT s.line, s.id FROM {_STAGING} s JOIN "{table}" t ON t.id = s.id'
+        ))
+        for line, id in existing:
+            errors[line].append(f"id {id} already exists")
+
+        for column, referenced in target.foreign_keys.items():
+            missing = connection.execute(text(
+                f'SELECT s.line, s."{column}" FROM {_STAGING} s WHERE s."{column}" IS NOT NULL '
+                f'AND NOT EXISTS (SELECT 1 FROM "{referenced}" r WHERE r.id = s."{column}")'
+            ))
+            for line, value in missing:
+                errors[line].append(f"{column} {value} does not exist")
+
+        return errors
+
+    @staticmethod
+    def _errors(error: Exception) -> List[str]:
+        if isinstance(error, ValidationError):
+            return [
+                f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+                for detail in error.errors()
+            ]
+        return [str(error)]
@@ -1,25 +1,55 @@
-from sqlalchemy.orm import Session
 from typing import Optional
 from models.discount import Discount
-from api.v1.schemas.discount import DiscountRead
 from datetime import date
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from models.book import Book
 
 
 class DiscountService:
     @staticmethod
-    def get_current_discount_for_book(book_id: int, db: Session) -> Optional[DiscountRead]:
-        discount = (
-            db.query(Discount)
-            .filter(
-                Discount.book_id == book_id,
-                or_(
-                    Discount.discount_end_date == None,
-                    Discount.discount_end_date > date.today()
-                )
+    def active_discount_filter(today: Optional[date] = None):
+        """
+        SQL condition matching discounts that are still running on the given day
+
+        Args:
+            today: Reference date, defaults to the current date
+
+        Returns:
+            SQLAlchemy boolean expression usable in filter/where clauses
+        """
+        today = today or date.today()
+        return or_(
+            Discount.discount_end_date == None,
+            Discount.discount_end_date > today
+        )
+
+    @staticmethod
+    def best_active_discount(today: Optional[date] = None):
+        """
+        LATERAL subquery selecting the best active discount of the enclosing book row
+
+        The best discount is the one with the lowest discount price. Join it with
+        `.outerjoin(DiscountService.best_active_discount(), true())` on a query over Book.
+
+        Args:
+            today: Reference date, defaults to the current date
+
+        Returns:
+            Lateral subquery with the discount columns
+        """
+        return (
+            select(
+                Discount.id,
+                Discount.book_id,
+                Discount.discount_start_date,
+                Discount.discount_end_date,
+                Discount.discount_price
+            )
+            .where(
+                Discount.book_id == Book.id,
+                DiscountService.active_discount_filter(today)
             )
-            .first()
+            .order_by(Discount.discount_price.asc(), Discount.id.asc())
+            .limit(1)
+            .lateral("active_discount")
         )
-        if not discount:
-            return None
-        return DiscountRead.model_validate(discount)
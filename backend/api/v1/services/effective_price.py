@@ -0,0 +1,158 @@
+import asyncio
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import select, func, true, event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api.v1.services.discount import DiscountService
+from models.book import Book
+from models.book_effective_price import BookEffectivePrice
+from models.discount import Discount
+
+
+class EffectivePriceService:
+    """
+    Keeps book_effective_price in sync with books and discounts.
+
+    A row only changes when the book price or its discounts change, or when
+    its active discount ends (expires_on), so it is refreshed on those writes
+    and rolled over once per day.
+    """
+
+    _rolled_over_on: Optional[date] = None
+    _rollover_lock = asyncio.Lock()
+
+    @staticmethod
+    def refresh_statement(book_filter=None, today: Optional[date] = None):
+        """
+        Build the upsert recomputing the projection for the books matching book_filter
+
+        Args:
+            book_filter: Optional WHERE condition on Book, all books when omitted
+            today: Reference date for active discounts, defaults to the current date
+
+        Returns:
+            INSERT ... SELECT ... ON CONFLICT DO UPDATE statement
+        """
+        discount = DiscountService.best_active_discount(today)
+
+        source = (
+            select(
+                Book.id,
+                discount.c.id,
+                func.coalesce(discount.c.discount_price, Book.book_price),
+                func.coalesce(Book.book_price - discount.c.discount_price, 0),
+                discount.c.discount_end_date
+            )
+            .select_from(Book)
+            .outerjoin(discount, true())
+        )
+        if book_filter is not None:
+            source = source.where(book_filter)
+
+        stmt = pg_insert(BookEffectivePrice).from_select(
+            ["book_id", "discount_id", "final_price", "discount_amount", "expires_on"],
+            source
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[BookEffectivePrice.book_id],
+            set_={
+                "discount_id": stmt.excluded.discount_id,
+                "final_price": stmt.excluded.final_price,
+                "discount_amount": stmt.excluded.discount_amount,
+                "expires_on": stmt.excluded.expires_on,
+            }
+        )
+
+    @staticmethod
+    def refresh_books(book_ids: Iterable[int], connection: Connection) -> None:
+        """Recompute the projection of the given books in the caller's transaction"""
+        book_ids = [book_id for book_id in set(book_ids) if book_id is not None]
+        if book_ids:
+            connection.execute(EffectivePriceService.refresh_statement(Book.id.in_(book_ids)))
+
+    @staticmethod
+    def refresh_all(db: Session) -> int:
+        """
+        Recompute the projection of every book
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of refreshed books
+        """
+        result = db.execute(EffectivePriceService.refresh_statement())
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def rollover(db: Session, today: Optional[date] = None) -> int:
+        """
+        Recompute books whose active discount has ended, and books missing from the projection
+
+        Args:
+            db: Database session
+            today: Reference date, defaults to the current date
+
+        Returns:
+            Number of refreshed books
+        """
+        today = today or date.today()
+        result = db.execute(
+            EffectivePriceService.refresh_statement(EffectivePriceService.stale_books_filter(today), today)
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def stale_books_filter(today: date):
+        """Condition on Book matching books whose projection row is missing or expired"""
+        fresh = (
+            select(BookEffectivePrice.book_id)
+            .where(
+                BookEffectivePrice.book_id == Book.id,
+                (BookEffectivePrice.expires_on == None) | (BookEffectivePrice.expires_on > today)
+            )
+        )
+        return ~fresh.exists()
+
+    @staticmethod
+    async def ensure_current(db: AsyncSession) -> None:
+        """
+        Run the daily rollover on the first call of each day in this process
+
+        The rollover commits, so it runs on its own session from the engine of
+        db and never commits the caller's transaction.
+        """
+        today = date.today()
+        if EffectivePriceService._rolled_over_on == today:
+            return
+
+        async with EffectivePriceService._rollover_lock:
+            if EffectivePriceService._rolled_over_on != today:
+                async with AsyncSession(db.bind) as rollover_db:
+                    await rollover_db.run_sync(EffectivePriceService.rollover, today)
+                EffectivePriceService._rolled_over_on = today
+
+
+@event.listens_for(Book, "after_insert")
+def _book_inserted(mapper, connection, target):
+    EffectivePriceService.refresh_books([target.id], connection)
+
+
+@event.listens_for(Book, "after_update")
+def _book_updated(mapper, connection, target):
+    if inspect(target).attrs.book_price.history.has_changes():
+        EffectivePriceService.refresh_books([target.id], connection)
+
+
+@event.listens_for(Discount, "after_insert")
+@event.listens_for(Discount, "after_update")
+@event.listens_for(Discount, "after_delete")
+def _discount_changed(mapper, connection, target):
+    EffectivePriceService.refresh_books([target.book_id], connection)
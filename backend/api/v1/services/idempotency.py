@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, null, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models.idempotency_key import IdempotencyKey
+
+# How long a key replays its response
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+class IdempotencyService:
+    """
+    Idempotency-Key handling for create requests.
+
+    A request claims its key by inserting the key row in its own transaction
+    and stores its response in the same transaction before committing, so a
+    key either has a stored response or no committed row at all. A concurrent
+    request with the same key blocks on the unique key until the first one
+    commits, then replays the stored response; if the first one rolls back,
+    the second one claims the key and runs.
+    """
+
+    @staticmethod
+    def request_hash(payload: dict) -> str:
+        """Digest of a request body, stable across key order"""
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    async def claim(user_id: int, key: str, request_hash: str, db: AsyncSession) -> Optional[dict]:
+        """
+        Claim a key in the current transaction, or get the response stored for it
+
+        Args:
+            user_id: ID of the user sending the request
+            key: Idempotency-Key header value
+            request_hash: Digest of the request body, see request_hash
+            db: Database session, the claim is released if it rolls back
+
+        Returns:
+            None when the key was claimed and the request should run,
+            otherwise the stored response to replay
+
+        Raises:
+            HTTPException:
+                - 409 if the key is held by a request that has not finished
+                - 422 if the key was used for a different request
+        """
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            created_at=now
+        )
+        # Keys past the retention window are claimed again
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={"request_hash": stmt.excluded.request_hash, "response": null(), "created_at": now},
+            where=IdempotencyKey.created_at < IdempotencyService.cutoff(now)
+        ).returning(IdempotencyKey.user_id)
+
+        if (await db.execute(stmt)).first() is not None:
+            return None
+
+        stored = (await db.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.response)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        )).first()
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        if stored.response is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+        return stored.response
+
+    @staticmethod
+    async def store_response(user_id: int, key: str, response: dict, db: AsyncSession) -> None:
+        """Save the response of a claimed key, in the transaction that claimed it"""
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(response=response)
+        )
+
+    @staticmethod
+    def cutoff(now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)) - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        """
+        Delete keys past the retention window
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of deleted keys
+        """
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < IdempotencyService.cutoff()))
+        db.commit()
+        return result.rowcount
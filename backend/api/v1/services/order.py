@@ -1,27 +1,42 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, Numeric, column, desc, func, insert, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import List, Optional
 
 from api.v1.schemas.order import (
     OrderCreate,
     OrderRead,
     OrderClientInput,
     OrderItemCreate,
+    OrderItemRead,
+    OrderSummary,
     OrderError
 )
+from api.v1.schemas.query import OrderFilter
+from api.v1.schemas.common import PaginatedResponse, PaginationMeta
 from api.v1.schemas.book import BookReadSimple
 from models.order import Order
 from models.order_item import OrderItem
 from api.v1.services.book import BookService
+from api.v1.services.idempotency import IdempotencyService
+from api.v1.utils.pagination import encode_cursor, decode_cursor, keyset_condition
+
+# Order history sort keys, newest first; served by ix_order_user_id_order_date_id
+# for one user and by ix_order_order_date_id across users
+ORDER_SORT_KEYS = [(Order.order_date, True), (Order.id, True)]
+ORDER_SORT_KEY_TYPES = [datetime.fromisoformat, int]
+ORDER_SORT_NAME = "order_date:id:desc"
 
 
 class OrderService:
     @staticmethod
-    def create_order_from_client_input(
+    async def create_order_from_client_input(
         client_order_data: OrderClientInput,
-        db: Session,
-        user_id: int
+        db: AsyncSession,
+        user_id: int,
+        idempotency_key: Optional[str] = None
     ) -> OrderRead:
         """
         Create an order from client input, validating prices against database values.
@@ -30,6 +45,8 @@ class OrderService:
             client_order_data: Order data from client
             db: Database session
             user_id: ID of the user placing the order
+            idempotency_key: Key claimed with IdempotencyService.claim, the
+                created order is stored for it in the same transaction
 
         Returns:
             Created order
@@ -45,17 +62,19 @@ class OrderService:
         not_found_books: List[int] = []
         total_amount = Decimal('0.00')
 
+        # Price the whole cart with one query
+        books = await BookService.get_book_details([item.book_id for item in client_order_data.order_items], db)
+
         for item in client_order_data.order_items:
-            # Get book from database
-            book = BookService.get_book_by_id(item.book_id, db)
+            book = books.get(item.book_id)
             if not book:
                 not_found_books.append(item.book_id)
                 continue
 
             # Calculate actual price
-            actual_price = book.book_price
-            if book.discount and book.discount.discount_price:
-                actual_price = book.discount.discount_price
+            actual_price = book["book_price"]
+            if book["discount"] and book["discount"]["discount_price"]:
+                actual_price = book["discount"]["discount_price"]
 
             actual_price_float = float(round(actual_price, 2))
             client_price_float = round(item.price, 2)
@@ -91,37 +110,142 @@ class OrderService:
             order_amount=total_amount,
             order_items=validated_items
         )
-        return OrderService.create_order(order_data, db, user_id)
+        return await OrderService.create_order(order_data, db, user_id, idempotency_key)
 
     @staticmethod
-    def create_order(order_data: OrderCreate, db: Session, user_id: int) -> OrderRead:
+    async def create_order(
+        order_data: OrderCreate,
+        db: AsyncSession,
+        user_id: int,
+        idempotency_key: Optional[str] = None
+    ) -> OrderRead:
         """
         Internal method to create an order with pre-validated data.
 
+        The order and all its items are written by one statement: the order
+        INSERT runs in a CTE and its id feeds a multi-row INSERT of the items,
+        which returns everything OrderRead needs, so nothing is read back.
+
         Args:
             order_data: Validated order data
             db: Database session
             user_id: ID of the user placing the order
+            idempotency_key: Claimed key to store the created order for
 
         Returns:
             Created order
         """
-        order = Order(
-            user_id=user_id,
-            order_amount=order_data.order_amount
+        order_date = order_data.order_date or datetime.utcnow()
+        new_order = (
+            insert(Order)
+            .values(
+                user_id=user_id,
+                order_date=order_date,
+                order_amount=order_data.order_amount,
+                item_count=sum(item.quantity for item in order_data.order_items)
+            )
+            .returning(Order.id)
+            .cte("new_order")
         )
-        db.add(order)
-        db.flush()
-
-        for item_data in order_data.order_items:
-            item = OrderItem(
-                order_id=order.id,
-                book_id=item_data.book_id,
-                quantity=item_data.quantity,
-                price=item_data.price
+        items = values(
+            column("book_id", Integer),
+            column("quantity", Integer),
+            column("price", Numeric(5, 2)),
+            name="items"
+        ).data([(item.book_id, item.quantity, item.price) for item in order_data.order_items])
+
+        stmt = (
+            insert(OrderItem)
+            .from_select(
+                ["order_id", "book_id", "quantity", "price"],
+                select(new_order.c.id, items.c.book_id, items.c.quantity, items.c.price)
+                .select_from(new_order)
+                .join(items, true())
             )
-            db.add(item)
+            .add_cte(new_order)
+            .returning(OrderItem.id, OrderItem.order_id, OrderItem.book_id, OrderItem.quantity, OrderItem.price)
+        )
+        rows = sorted((await db.execute(stmt)).all(), key=lambda row: row.id)
+        order = OrderRead(
+            id=rows[0].order_id,
+            user_id=user_id,
+            order_date=order_date,
+            order_amount=order_data.order_amount,
+            order_items=[OrderItemRead.model_validate(row) for row in rows]
+        )
+
+        if idempotency_key is not None:
+            await IdempotencyService.store_response(user_id, idempotency_key, order.model_dump(mode="json"), db)
+        await db.commit()
+        return order
+
+    @staticmethod
+    async def get_orders(
+        filter_params: OrderFilter,
+        db: AsyncSession,
+        user_id: Optional[int] = None
+    ) -> PaginatedResponse[OrderSummary]:
+        """
+        Get a page of order history, newest first
+
+        Orders carry their item count and amount, so order items are not read.
+
+        Args:
+            filter_params: Pagination parameters, a cursor continues after the last seen order
+            db: Database session
+            user_id: Only list the orders of this user, all users when None
+
+        Returns:
+            Paginated order summaries; total is None in cursor mode
 
-        db.commit()
-        db.refresh(order)
-        return OrderRead.model_validate(order)
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(Order.id, Order.user_id, Order.order_date, Order.order_amount, Order.item_count)
+        if user_id is not None:
+            query = query.where(Order.user_id == user_id)
+        query = query.order_by(*[desc(column) if descending else column for column, descending in ORDER_SORT_KEYS])
+
+        total_count = None
+        if filter_params.cursor:
+            values = decode_cursor(filter_params.cursor, ORDER_SORT_NAME, ORDER_SORT_KEY_TYPES)
+            query = query.where(keyset_condition(ORDER_SORT_KEYS, values))
+            offset = 0
+        else:
+            # The total comes with the page rows, computed before LIMIT/OFFSET
+            query = query.add_columns(func.count().over().label("total_count"))
+            offset = (filter_params.page - 1) * filter_params.size
+
+        rows = (await db.execute(query.offset(offset).limit(filter_params.size + 1))).all()
+
+        if not filter_params.cursor:
+            if rows:
+                total_count = rows[0].total_count
+            elif offset > 0:
+                # A page past the end carries no window count
+                count_query = select(func.count()).select_from(Order)
+                if user_id is not None:
+                    count_query = count_query.where(Order.user_id == user_id)
+                total_count = (await db.execute(count_query)).scalar() or 0
+            else:
+                total_count = 0
+
+        next_cursor = None
+        if len(rows) > filter_params.size:
+            rows = rows[:filter_params.size]
+            next_cursor = encode_cursor(ORDER_SORT_NAME, [rows[-1].order_date, rows[-1].id])
+
+        total_pages = None
+        if total_count is not None:
+            total_pages = (total_count + filter_params.size - 1) // filter_params.size if total_count > 0 else 0
+
+        return PaginatedResponse[OrderSummary](
+            data=[OrderSummary.model_validate(row) for row in rows],
+            meta=PaginationMeta(
+                total=total_count,
+                total_pages=total_pages,
+                page=filter_params.page,
+                size=filter_params.size,
+                next_cursor=next_cursor
+            )
+        )
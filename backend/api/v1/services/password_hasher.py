@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from api.v1.utils.password import verify_password
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+# Hash requests allowed to wait for a worker, more are rejected
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 16))
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every password hashing worker is busy and the queue is full"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small dedicated process pool.
+
+    Hashing no longer holds threadpool slots or the GIL of the API process,
+    and at most PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT requests
+    are in flight; beyond that callers get PasswordHasherBusy right away
+    instead of queueing behind a login burst.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+    _in_flight = 0
+    _completed = 0
+    _rejected = 0
+    _total_latency = 0.0
+    _max_latency = 0.0
+
+    @staticmethod
+    async def verify(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash, see verify_password"""
+        return await PasswordHasher._run(verify_password, plain_password, hashed_password)
+
+    @staticmethod
+    async def _run(function, *args):
+        with PasswordHasher._lock:
+            if PasswordHasher._in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+                PasswordHasher._rejected += 1
+                raise PasswordHasherBusy()
+            PasswordHasher._in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(PasswordHasher._get_executor(), function, *args)
+        finally:
+            latency = time.perf_counter() - start
+            with PasswordHasher._lock:
+                PasswordHasher._in_flight -= 1
+                PasswordHasher._completed += 1
+                PasswordHasher._total_latency += latency
+                PasswordHasher._max_latency = max(PasswordHasher._max_latency, latency)
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        with PasswordHasher._lock:
+            if PasswordHasher._executor is None:
+                # Spawned workers do not inherit the threads and connections of the API process
+                PasswordHasher._executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return PasswordHasher._executor
+
+    @staticmethod
+    def shutdown() -> None:
+        with PasswordHasher._lock:
+            executor, PasswordHasher._executor = PasswordHasher._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def stats() -> dict:
+        """Load and latency of the hashing pool; latency includes the wait for a worker"""
+        with PasswordHasher._lock:
+            completed = PasswordHasher._completed
+            return {
+                "workers": PASSWORD_HASH_WORKERS,
+                "queue_limit": PASSWORD_HASH_QUEUE_LIMIT,
+                "in_flight": PasswordHasher._in_flight,
+                "completed": completed,
+                "rejected": PasswordHasher._rejected,
+                "avg_latency_ms": round(PasswordHasher._total_latency / completed * 1000, 3) if completed else 0.0,
+                "max_latency_ms": round(PasswordHasher._max_latency * 1000, 3),
+            }
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from models.user import User
+
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 5))
+# Never longer than an access token lives
+PRINCIPAL_CACHE_TTL_SECONDS = min(
+    int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60)),
+    ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+
+_SESSION_KEY = "changed_users"
+
+
+class PrincipalCache:
+    """
+    In-process cache of authenticated users, keyed by user id and checked
+    against the email of the access token.
+
+    Committed user updates and deletes and refresh token revocations evict
+    the user. Other workers see those changes once their entry expires,
+    after PRINCIPAL_CACHE_TTL_SECONDS at most.
+    """
+
+    _entries: "OrderedDict[int, tuple]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(user_id: int, email: str) -> Optional[User]:
+        with PrincipalCache._lock:
+            entry = PrincipalCache._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic() or user.email != email:
+                del PrincipalCache._entries[user_id]
+                return None
+            PrincipalCache._entries.move_to_end(user_id)
+            return user
+
+    @staticmethod
+    def set(user: User) -> None:
+        # Detached copy without the password hash, safe to share between requests
+        principal = User(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            admin=user.admin
+        )
+        with PrincipalCache._lock:
+            PrincipalCache._entries[user.id] = (time.monotonic() + PRINCIPAL_CACHE_TTL_SECONDS, principal)
+            PrincipalCache._entries.move_to_end(user.id)
+            while len(PrincipalCache._entries) > PRINCIPAL_CACHE_MAX_ENTRIES:
+                PrincipalCache._entries.popitem(last=False)
+
+    @staticmethod
+    def invalidate(user_ids: Iterable[int]) -> None:
+        with PrincipalCache._lock:
+            for user_id in user_ids:
+                PrincipalCache._entries.pop(user_id, None)
+
+    @staticmethod
+    def record(db: Session, user_ids: Iterable[int]) -> None:
+        """Evict the users when the session commits, for writes made with Core statements"""
+        db.info.setdefault(_SESSION_KEY, set()).update(user_id for user_id in user_ids if user_id is not None)
+
+
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        PrincipalCache.record(session, [target.id])
+
+
+event.listen(User, "after_update", _user_changed)
+event.listen(User, "after_delete", _user_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    user_ids = session.info.pop(_SESSION_KEY, None)
+    if user_ids:
+        PrincipalCache.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(_SESSION_KEY, None)
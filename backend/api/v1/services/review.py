@@ -1,25 +1,19 @@
-from sqlalchemy.orm import Session
-from api.v1.schemas.review import AverageRating, ReviewCreate, ReviewRead
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.v1.schemas.review import ReviewCreate, ReviewRead
 from models.review import Review
-from sqlalchemy.sql import func
+from api.v1.services.book_stats import BookStatsService
 from fastapi.logger import logger
 
 
 class ReviewService:
     @staticmethod
-    def get_average_rating_for_book(book_id: int, db: Session) -> AverageRating:
-        avg_rating = db.query(func.round(func.avg(Review.rating_star), 2))\
-            .filter(Review.book_id == book_id)\
-            .scalar()
-
-        return AverageRating(average_rating=float(avg_rating or 0))
-
-    @staticmethod
-    def post_review_for_book(book_id: int, review_data: ReviewCreate, db: Session) -> ReviewRead:
+    async def post_review_for_book(book_id: int, review_data: ReviewCreate, db: AsyncSession) -> ReviewRead:
         review = Review(**review_data.model_dump(), book_id=book_id)
         logger.info(f"Creating review for book {book_id}")
         logger.info(f"Review data: {review}")
         db.add(review)
-        db.commit()
-        db.refresh(review)
+        # Keep the book stats in the same transaction as the review
+        await BookStatsService.record_review(book_id, review.rating_star, db)
+        await db.commit()
+        # The id comes back with the INSERT and nothing is expired on commit, no reload needed
         return ReviewRead.model_validate(review)
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi.logger import logger
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from models.token import Token
+
+TOKEN_PURGE_INTERVAL_SECONDS = int(os.getenv("TOKEN_PURGE_INTERVAL_SECONDS", 3600))
+TOKEN_PURGE_BATCH_SIZE = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", 1000))
+# Pause between batches, so the purge never holds a connection for long
+TOKEN_PURGE_BATCH_PAUSE_SECONDS = float(os.getenv("TOKEN_PURGE_BATCH_PAUSE_SECONDS", 0.5))
+# Batches per run, the rest waits for the next run
+TOKEN_PURGE_MAX_BATCHES = int(os.getenv("TOKEN_PURGE_MAX_BATCHES", 100))
+
+
+class TokenPurgeService:
+    """
+    Deletes expired and revoked refresh tokens in the background.
+
+    Each batch is its own short transaction that skips rows locked by
+    foreground requests, and batches are spaced out, so the purge trickles
+    through a large backlog instead of competing with logins and refreshes.
+    """
+
+    _task: Optional[asyncio.Task] = None
+    _stats = {
+        "runs": 0,
+        "purged_total": 0,
+        "last_run_at": None,
+        "last_run_purged": 0,
+        "last_run_seconds": 0.0,
+        "table_rows_estimate": None,
+        "table_bytes": None,
+    }
+
+    @staticmethod
+    async def purge_batch(db: AsyncSession, condition) -> int:
+        """
+        Delete one batch of tokens matching condition
+
+        Args:
+            db: Database session, committed after the batch
+            condition: WHERE condition on Token, see purge_conditions
+
+        Returns:
+            Number of deleted tokens
+        """
+        batch = (
+            select(Token.id)
+            .where(condition)
+            .limit(TOKEN_PURGE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(delete(Token).where(Token.id.in_(batch.scalar_subquery())))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def purge_conditions(now: Optional[datetime] = None) -> list:
+        """
+        Conditions of the purged tokens, purged one after the other
+
+        Each one is served by its own index, ix_token_expires_at and the
+        partial ix_token_revoked, where an OR of both would scan the table.
+        """
+        now = now or datetime.now(timezone.utc)
+        # Bare revoked, matching the predicate of the partial index
+        return [Token.expires_at < now, Token.revoked]
+
+    @staticmethod
+    async def purge(db: AsyncSession) -> int:
+        """
+        Delete expired and revoked tokens in rate-limited batches
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of deleted tokens
+        """
+        started = time.perf_counter()
+        purged = 0
+        batches = 0
+        for condition in TokenPurgeService.purge_conditions():
+            while batches < TOKEN_PURGE_MAX_BATCHES:
+                deleted = await TokenPurgeService.purge_batch(db, condition)
+                purged += deleted
+                batches += 1
+                if deleted < TOKEN_PURGE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(TOKEN_PURGE_BATCH_PAUSE_SECONDS)
+
+        size = (await db.execute(text(
+            "SELECT reltuples::BIGINT AS rows, pg_total_relation_size(oid) AS bytes "
+            "FROM pg_class WHERE oid = 'token'::regclass"
+        ))).first()
+
+        stats = TokenPurgeService._stats
+        stats["runs"] += 1
+        stats["purged_total"] += purged
+        stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        stats["last_run_purged"] = purged
+        stats["last_run_seconds"] = round(time.perf_counter() - started, 3)
+        if size is not None:
+            # reltuples is -1 until the table is first analyzed
+            stats["table_rows_estimate"] = max(size.rows, 0)
+            stats["table_bytes"] = size.bytes
+
+        logger.info(f"Purged {purged} refresh tokens, token table is {stats['table_bytes']} bytes")
+        return purged
+
+    @staticmethod
+    def stats() -> dict:
+        """Rows purged by this worker and the size of the token table at the last run"""
+        return dict(TokenPurgeService._stats)
+
+    @staticmethod
+    def start(engine: AsyncEngine) -> None:
+        """Start the background purge task on the running event loop"""
+        if TokenPurgeService._task is not None and not TokenPurgeService._task.done():
+            return
+        TokenPurgeService._task = asyncio.create_task(TokenPurgeService._run(engine))
+
+    @staticmethod
+    async def stop() -> None:
+        if TokenPurgeService._task is not None:
+            TokenPurgeService._task.cancel()
+            try:
+                await TokenPurgeService._task
+            except asyncio.CancelledError:
+                pass
+            TokenPurgeService._task = None
+
+    @staticmethod
+    async def _run(engine: AsyncEngine) -> None:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        while True:
+            try:
+                async with session_factory() as db:
+                    await TokenPurgeService.purge(db)
+            except Exception as e:
+                logger.error(f"Error purging refresh tokens: {e}")
+            await asyncio.sleep(TOKEN_PURGE_INTERVAL_SECONDS)
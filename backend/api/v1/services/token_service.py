@@ -1,7 +1,11 @@
 from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import update
 from sqlmodel import Session, select
 from models.token import Token
+from models.user import User
 from api.v1.utils.password import hash_token, verify_token
+from api.v1.services.principal_cache import PrincipalCache
 
 class TokenService:
     @staticmethod
@@ -16,10 +20,76 @@ class TokenService:
             expires_at=expires_at,
         )
         db.add(token)
+        # The id comes back with the INSERT; callers do not read the token after commit, so no reload
         db.commit()
-        db.refresh(token)
         return token
 
+    @staticmethod
+    def rotate_refresh_token(
+        db: Session,
+        jti: str,
+        email: str,
+        plain_refresh_token: str,
+        new_jti: str,
+        new_refresh_token: str,
+        new_expires_at: datetime
+    ) -> Optional[User]:
+        """
+        Revoke a refresh token and store its replacement in one transaction
+
+        The old token is revoked with a conditional UPDATE that also returns
+        its owner, so of two concurrent refreshes with the same token only
+        the first one finds it unrevoked; the other gets None.
+
+        Args:
+            db: Database session
+            jti: JWT ID of the token being used
+            email: Subject of the token, must still be the owner's email
+            plain_refresh_token: Plain text token being used
+            new_jti: JWT ID of the replacement token
+            new_refresh_token: Plain text replacement token
+            new_expires_at: Expiration of the replacement token
+
+        Returns:
+            The owner of the token (without password) if it was valid, unrevoked
+            and unexpired, None otherwise
+        """
+        revoked = db.execute(
+            update(Token)
+            .where(
+                Token.jti == jti,
+                Token.revoked == False,
+                Token.expires_at > datetime.now(timezone.utc),
+                User.id == Token.user_id,
+                User.email == email
+            )
+            .values(revoked=True)
+            .returning(Token.refresh_token, User.id, User.first_name, User.last_name, User.email, User.admin)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        # Check the hash after the row is locked, a mismatch rolls the revocation back
+        if revoked is None or not verify_token(plain_refresh_token, revoked.refresh_token):
+            db.rollback()
+            return None
+
+        db.add(Token(
+            user_id=revoked.id,
+            jti=new_jti,
+            refresh_token=hash_token(new_refresh_token),
+            expires_at=new_expires_at,
+        ))
+        PrincipalCache.record(db, [revoked.id])
+        db.commit()
+
+        return User(
+            id=revoked.id,
+            first_name=revoked.first_name,
+            last_name=revoked.last_name,
+            email=revoked.email,
+            admin=revoked.admin
+        )
+
     @staticmethod
     def get_by_jti(db: Session, jti: str) -> Token:
         return db.exec(select(Token).where(Token.jti == jti)).first()
@@ -30,6 +100,7 @@ class TokenService:
         if token:
             token.revoked = True
             db.add(token)
+            PrincipalCache.record(db, [token.user_id])
             db.commit()
         return token
 
@@ -50,35 +121,6 @@ class TokenService:
 
         return expires_at > now
 
-    @staticmethod
-    def verify_refresh_token(db: Session, jti: str, plain_refresh_token: str) -> bool:
-        """
-        Verify a refresh token against the stored hash
-
-        Args:
-            db: Database session
-            jti: JWT ID
-            plain_refresh_token: Plain text refresh token to verify
-
-        Returns:
-            True if token is valid and matches the hash, False otherwise
-        """
-        token = TokenService.get_by_jti(db, jti)
-        if token is None or token.revoked:
-            return False
-
-        # Verify the token against the stored hash
-        if not verify_token(plain_refresh_token, token.refresh_token):
-            return False
-
-        # Check if token is expired
-        now = datetime.now(timezone.utc)
-        expires_at = token.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-        return expires_at > now
-
     @staticmethod
     def revoke_all_user_tokens(db: Session, user_id: int) -> int:
         """
@@ -108,6 +150,7 @@ class TokenService:
 
         # Commit changes if any tokens were revoked
         if count > 0:
+            PrincipalCache.record(db, [user_id])
             db.commit()
 
         return count
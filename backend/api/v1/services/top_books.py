@@ -0,0 +1,131 @@
+import asyncio
+import os
+import uuid
+from typing import Dict, List, Optional, Set
+
+from fastapi.logger import logger
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from api.v1.schemas.book import BookReadSimpleWithRating
+from api.v1.schemas.query import BookSortField, SortDirection
+from api.v1.services.book_listing import BookListingQuery
+from api.v1.services.catalog_events import CatalogEvents
+from models.book_effective_price import BookEffectivePrice
+
+ON_SALE_LIMIT = int(os.getenv("TOP_ON_SALE_LIMIT", 10))
+POPULAR_LIMIT = int(os.getenv("TOP_POPULAR_LIMIT", 8))
+TOP_BOOKS_REFRESH_SECONDS = int(os.getenv("TOP_BOOKS_REFRESH_SECONDS", 300))
+
+# Writes usually come in bursts, wait a little to reload once for all of them
+REFRESH_DEBOUNCE_SECONDS = 0.5
+
+
+class TopBooksService:
+    """
+    In-memory top-N lists for the home page: biggest discounts and most reviewed books.
+
+    A background task reloads the lists every TOP_BOOKS_REFRESH_SECONDS and
+    shortly after committed discount, book or review writes, so requests are
+    served from memory.
+    """
+
+    _on_sale: Optional[List[BookReadSimpleWithRating]] = None
+    _popular: Optional[List[BookReadSimpleWithRating]] = None
+    _wake: Optional[asyncio.Event] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _task: Optional[asyncio.Task] = None
+    # Changes with every reload, used as the HTTP ETag stamp of the lists
+    _stamp: str = uuid.uuid4().hex[:12]
+
+    @staticmethod
+    async def get_on_sale_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        if TopBooksService._on_sale is None:
+            await TopBooksService.refresh(db)
+        return TopBooksService._on_sale
+
+    @staticmethod
+    async def get_popular_books(db: AsyncSession) -> List[BookReadSimpleWithRating]:
+        if TopBooksService._popular is None:
+            await TopBooksService.refresh(db)
+        return TopBooksService._popular
+
+    @staticmethod
+    async def refresh(db: AsyncSession) -> None:
+        """Reload both lists from the database"""
+        on_sale = (
+            BookListingQuery()
+            .sort(BookSortField.ON_SALE, SortDirection.DESC)
+        )
+        on_sale.stmt = on_sale.stmt.where(BookEffectivePrice.discount_amount > 0)
+
+        popular = (
+            BookListingQuery()
+            .sort(BookSortField.POPULARITY, SortDirection.DESC)
+        )
+
+        on_sale_books = await on_sale.fetch(db, limit=ON_SALE_LIMIT)
+        popular_books = await popular.fetch(db, limit=POPULAR_LIMIT)
+
+        # Swap both lists without awaiting in between
+        TopBooksService._on_sale = on_sale_books
+        TopBooksService._popular = popular_books
+        TopBooksService._stamp = uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def stamp() -> str:
+        """Identifier of the lists currently held by this process"""
+        return TopBooksService._stamp
+
+    @staticmethod
+    def invalidate(changes: Optional[Dict[str, Set[int]]] = None) -> None:
+        """
+        Schedule a reload, or drop the lists when the refresher is not running
+
+        Called after commits, possibly from threadpool workers using sync sessions.
+        """
+        if TopBooksService._task is not None and not TopBooksService._task.done():
+            TopBooksService._loop.call_soon_threadsafe(TopBooksService._wake.set)
+        else:
+            TopBooksService._on_sale = None
+            TopBooksService._popular = None
+            TopBooksService._stamp = uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def start(engine: AsyncEngine) -> None:
+        """Start the background refresher task on the running event loop"""
+        if TopBooksService._task is not None and not TopBooksService._task.done():
+            return
+
+        TopBooksService._loop = asyncio.get_running_loop()
+        TopBooksService._wake = asyncio.Event()
+        TopBooksService._task = asyncio.create_task(TopBooksService._run(engine))
+
+    @staticmethod
+    async def stop() -> None:
+        if TopBooksService._task is not None:
+            TopBooksService._task.cancel()
+            try:
+                await TopBooksService._task
+            except asyncio.CancelledError:
+                pass
+            TopBooksService._task = None
+
+    @staticmethod
+    async def _run(engine: AsyncEngine) -> None:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        while True:
+            try:
+                async with session_factory() as db:
+                    await TopBooksService.refresh(db)
+            except Exception as e:
+                logger.error(f"Error refreshing top books: {e}")
+
+            try:
+                await asyncio.wait_for(TopBooksService._wake.wait(), TOP_BOOKS_REFRESH_SECONDS)
+                await asyncio.sleep(REFRESH_DEBOUNCE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            TopBooksService._wake.clear()
+
+
+CatalogEvents.subscribe(TopBooksService.invalidate)
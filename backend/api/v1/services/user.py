@@ -1,6 +1,7 @@
 from sqlmodel import Session, select
 from models.user import User
-from api.v1.utils.password import verify_password as verify_pwd
+from fastapi.concurrency import run_in_threadpool
+from api.v1.services.password_hasher import PasswordHasher
 from typing import Optional
 
 class UserService:
@@ -33,10 +34,13 @@ class UserService:
         return db.exec(select(User).where(User.email == email)).first()
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         """
         Authenticate a user with email and password
 
+        The user is looked up in the threadpool and the password checked in
+        the password hashing pool, so neither blocks the event loop.
+
         Args:
             db: Database session
             email: User email
@@ -44,10 +48,13 @@ class UserService:
 
         Returns:
             User object if authentication successful, None otherwise
+
+        Raises:
+            PasswordHasherBusy: If the password hashing pool is saturated
         """
-        user = UserService.get_by_email(db, email)
+        user = await run_in_threadpool(UserService.get_by_email, db, email)
         if not user:
             return None
-        if not verify_pwd(password, user.password):
+        if not await PasswordHasher.verify(password, user.password):
             return None
-        return user
\ No newline at end of file
+        return user
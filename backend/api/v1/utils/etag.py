@@ -0,0 +1,27 @@
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts: str) -> str:
+    """Strong ETag from the content or the data versions a response depends on"""
+    digest = hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2)
+
+    Args:
+        if_none_match: Raw header value, may list several tags or be "*"
+        etag: Current ETag of the resource
+
+    Returns:
+        True when the client copy is current and a 304 can be sent
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_key: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key values of the last row of a page into an opaque cursor
+
+    Args:
+        sort_key: Identifier of the active sort (field and direction)
+        values: Values of the sort columns for the last row, id last
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"s": sort_key, "v": list(values)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, converters: Sequence[Callable[[Any], Any]]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from the client
+        sort_key: Identifier of the sort the cursor must have been created for
+        converters: One converter per sort column, restoring the value types
+
+    Returns:
+        List of sort column values
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        if payload["s"] != sort_key or len(values) != len(converters):
+            raise ValueError("Cursor does not match the requested sort")
+        return [None if value is None else convert(value) for convert, value in zip(converters, values)]
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, ArithmeticError) as e:
+        raise ValueError("Malformed cursor") from e
+
+
+def keyset_condition(keys: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """
+    Build the WHERE condition selecting rows that come after the given values
+
+    Supports mixed sort directions, e.g. for keys (a DESC, b ASC, id ASC):
+    a < :a OR (a = :a AND b > :b) OR (a = :a AND b = :b AND id > :id)
+
+    Args:
+        keys: (column expression, descending) pairs in ORDER BY order
+        values: Values of those columns for the last row already returned
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[j][0] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
@@ -1,5 +1,12 @@
 from passlib.context import CryptContext
+from dotenv import load_dotenv
+import hashlib
+import hmac
 import logging
+import os
+
+# Load environment variables
+load_dotenv()
 
 # Create a password context for hashing and verifying passwords
 # Include multiple schemes to handle different password formats
@@ -9,12 +16,16 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
-# Create a separate context for refresh tokens with faster hashing
-token_context = CryptContext(
+# Refresh tokens stored before HMAC digests, verified until they are rotated
+legacy_token_context = CryptContext(
     schemes=["sha256_crypt"],
     deprecated="auto"
 )
 
+# Refresh tokens are random signed JWTs, a keyed digest is enough to store them
+TOKEN_DIGEST_PREFIX = "hmac-sha256$"
+REFRESH_TOKEN_PEPPER = os.getenv("REFRESH_TOKEN_PEPPER") or os.getenv("SECRET_KEY")
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -54,30 +65,38 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def hash_token(token: str) -> str:
     """
-    Hash a refresh token using SHA-256 algorithm
+    Digest a refresh token with HMAC-SHA256 and the server pepper
+
+    The digest is deterministic, so a stored token can be found by its digest.
 
     Args:
         token: Plain text refresh token
 
     Returns:
-        Hashed token
+        Prefixed hex digest
     """
-    return token_context.hash(token)
+    if not REFRESH_TOKEN_PEPPER:
+        raise RuntimeError("REFRESH_TOKEN_PEPPER or SECRET_KEY must be set to store refresh tokens")
+    digest = hmac.new(REFRESH_TOKEN_PEPPER.encode(), token.encode(), hashlib.sha256).hexdigest()
+    return f"{TOKEN_DIGEST_PREFIX}{digest}"
 
 
 def verify_token(plain_token: str, hashed_token: str) -> bool:
     """
-    Verify a refresh token against a hash
+    Verify a refresh token against its stored digest, or a legacy sha256_crypt hash
 
     Args:
         plain_token: Plain text token to verify
-        hashed_token: Hashed token to verify against
+        hashed_token: Stored digest to verify against
 
     Returns:
         True if token matches hash, False otherwise
     """
     try:
-        return token_context.verify(plain_token, hashed_token)
+        if hashed_token.startswith(TOKEN_DIGEST_PREFIX):
+            return hmac.compare_digest(hash_token(plain_token), hashed_token)
+        return legacy_token_context.verify(plain_token, hashed_token)
     except Exception as e:
         logger.warning(f"Token verification error: {str(e)}")
         return False
+
@@ -0,0 +1,37 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the standard library encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    """
+    Encode trusted, already shaped data to JSON without any validation
+
+    Uses orjson when it is installed. Decimals are encoded as numbers and
+    dates in ISO format, like the response schemas do.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default).decode()
+    return json.dumps(value, default=_default, separators=(",", ":"))
+
+
+class PreEncodedJSONResponse(Response):
+    """JSON response whose body was encoded beforehand, e.g. by dumps() or read from the cache"""
+
+    media_type = "application/json"
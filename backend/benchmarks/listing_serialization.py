@@ -0,0 +1,109 @@
+"""
+CPU cost of building and serializing one page of GET /books.
+
+Compares the validated path (listing items built as BookReadSimpleWithRating
+models, cached through jsonable_encoder, then validated again and encoded by
+FastAPI for the response_model) with the trusted path (plain dicts from
+BookListingQuery.to_item encoded once by dumps). No database is needed, the
+rows are synthetic.
+
+Usage:
+    python -m benchmarks.listing_serialization [--iterations N]
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from api.v1.schemas.book import BookReadSimpleWithRating
+from api.v1.schemas.common import PaginatedResponse, PaginationMeta
+from api.v1.services.book_listing import BookListingQuery
+from api.v1.utils.serialization import dumps, PreEncodedJSONResponse
+
+
+def make_rows(count: int) -> list:
+    """Rows shaped like the listing statement, with and without discounts and authors"""
+    Row = namedtuple("Row", BookListingQuery().stmt.selected_columns.keys())
+    rows = []
+    for i in range(1, count + 1):
+        discounted = i % 2 == 0
+        price = Decimal("19.99") + i
+        rows.append(Row(
+            id=i,
+            book_title=f"Book title {i}",
+            book_summary="A fairly long summary of the book. " * 4,
+            book_price=price,
+            book_cover_photo=f"book{i}",
+            author_id=i % 7 if i % 5 else None,
+            author_name=f"Author {i % 7}",
+            author_bio="Author biography",
+            category_id=i % 3,
+            category_name=f"Category {i % 3}",
+            category_desc="Category description",
+            discount_id=i if discounted else None,
+            discount_start_date=date(2024, 1, 1) if discounted else None,
+            discount_end_date=date(2024, 1, 1) + timedelta(days=i) if discounted else None,
+            discount_price=price - 5 if discounted else None,
+            review_count=i * 3,
+            avg_rating=Decimal("3.67"),
+            sub_price=Decimal("5.00") if discounted else Decimal("0.00"),
+            final_price=price - 5 if discounted else price,
+        ))
+    return rows
+
+
+def meta(size: int) -> PaginationMeta:
+    return PaginationMeta(total=2000, page=1, size=size, total_pages=2000 // size, next_cursor="eyJzIjoiIn0")
+
+
+def validated_page(rows, adapter: TypeAdapter) -> bytes:
+    page = PaginatedResponse[BookReadSimpleWithRating](
+        data=[BookListingQuery.to_book(row) for row in rows],
+        meta=meta(len(rows))
+    )
+    cached = jsonable_encoder(page)
+    # FastAPI validates the returned value against response_model, then encodes it
+    content = adapter.dump_python(adapter.validate_python(cached), mode="json")
+    return JSONResponse(content).body
+
+
+def trusted_page(rows, adapter: TypeAdapter) -> bytes:
+    body = dumps({"data": [BookListingQuery.to_item(row) for row in rows], "meta": meta(len(rows)).model_dump()})
+    return PreEncodedJSONResponse(body).body
+
+
+def measure(function, rows, adapter, iterations: int) -> float:
+    """Average CPU time per page in microseconds"""
+    function(rows, adapter)
+    start = time.process_time()
+    for _ in range(iterations):
+        function(rows, adapter)
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.listing_serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(PaginatedResponse[BookReadSimpleWithRating])
+
+    print(f"{'page size':>9} {'validated us':>13} {'trusted us':>11} {'speedup':>8}")
+    for size in (10, 25, 100):
+        rows = make_rows(size)
+        # Both paths must produce the same document
+        assert json.loads(validated_page(rows, adapter)) == json.loads(trusted_page(rows, adapter))
+
+        before = measure(validated_page, rows, adapter, args.iterations)
+        after = measure(trusted_page, rows, adapter, args.iterations)
+        print(f"{size:>9} {before:>13.1f} {after:>11.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import sys
+
+from database.postgres import get_database
+from api.v1.controllers.catalog_import import CatalogImportController
+from api.v1.schemas.catalog_import import ImportFormat, ImportKind
+from api.v1.services.catalog_import import CatalogImportService
+
+
+def import_catalog(argv=None) -> int:
+    """
+    Bulk import catalog rows from a CSV or NDJSON file.
+
+    Usage:
+        python -m database.import_catalog {authors,categories,books,discounts} FILE [--format csv|ndjson]
+
+    Import authors and categories before the books referencing them, and books before discounts.
+    """
+    parser = argparse.ArgumentParser(prog="python -m database.import_catalog", description="Bulk catalog import")
+    parser.add_argument("kind", choices=[kind.value for kind in ImportKind])
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=[file_format.value for file_format in ImportFormat])
+    args = parser.parse_args(argv)
+
+    file_format = ImportFormat(args.format) if args.format else CatalogImportController.detect_format(args.file)
+    if file_format is None:
+        print("Unknown file format, use --format")
+        return 2
+
+    print(f"Importing {args.kind} from {args.file}...")
+    db = next(get_database().get_session())
+
+    try:
+        with open(args.file, "rb") as stream:
+            report = CatalogImportService.import_rows(
+                ImportKind(args.kind),
+                CatalogImportService.read_rows(stream, file_format),
+                db
+            )
+    except Exception as e:
+        db.rollback()
+        print(f"Error importing {args.kind}: {e}")
+        return 1
+    finally:
+        db.close()
+
+    for row in report.rejected_rows:
+        print(f"  line {row.line}: {'; '.join(row.errors)}")
+    print(f"Imported {report.imported} of {report.received} rows, rejected {report.rejected}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(import_catalog())
@@ -0,0 +1,46 @@
+import argparse
+import sys
+
+from database.migrations.runner import MigrationRunner
+from database.postgres import get_database
+
+
+def migrate(argv=None) -> int:
+    """
+    Apply, verify or list schema migrations.
+
+    Usage:
+        python -m database.migrate upgrade [--target VERSION]
+        python -m database.migrate verify
+        python -m database.migrate status
+    """
+    parser = argparse.ArgumentParser(prog="python -m database.migrate", description="Schema migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade = commands.add_parser("upgrade", help="apply pending migrations")
+    upgrade.add_argument("--target", type=int, help="last version to apply")
+    commands.add_parser("verify", help="check that all migrations are applied and valid")
+    commands.add_parser("status", help="list migrations and when they were applied")
+    args = parser.parse_args(argv)
+
+    runner = MigrationRunner(get_database().engine)
+
+    if args.command == "upgrade":
+        print("Applying migrations...")
+        applied = runner.upgrade(args.target)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+        return 0
+
+    if args.command == "verify":
+        problems = runner.verify()
+        for problem in problems:
+            print(problem)
+        print("Schema verified" if not problems else f"{len(problems)} problem(s) found")
+        return 1 if problems else 0
+
+    for line in runner.status():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,145 @@
+import importlib
+import pkgutil
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+class CreateIndex:
+    """
+    Build an index with CREATE INDEX CONCURRENTLY, so writes to the table are not blocked.
+
+    A concurrent build that failed leaves an INVALID index behind, it is
+    dropped and rebuilt when the migration runs again.
+    """
+
+    # Concurrent builds cannot run inside a transaction block
+    transactional = False
+
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        columns: Sequence[str],
+        unique: bool = False,
+        using: Optional[str] = None,
+        where: Optional[str] = None
+    ):
+        self.name = name
+        self.table = table
+        self.columns = list(columns)
+        self.unique = unique
+        # Index method, e.g. "gin", btree when omitted
+        self.using = using
+        # SQL predicate of a partial index
+        self.where = where
+
+    def describe(self) -> str:
+        where = f" where {self.where}" if self.where else ""
+        return f"index {self.name} on {self.table} ({', '.join(self.columns)}){where}"
+
+    def apply(self, connection: Connection) -> None:
+        if self._is_valid(connection) is False:
+            connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{self.name}"'))
+
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        unique = "UNIQUE " if self.unique else ""
+        using = f" USING {self.using}" if self.using else ""
+        where = f" WHERE {self.where}" if self.where else ""
+        connection.execute(text(
+            f'CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS "{self.name}" ON "{self.table}"{using} ({columns}){where}'
+        ))
+
+    def verify(self, connection: Connection) -> Optional[str]:
+        valid = self._is_valid(connection)
+        if valid is None:
+            return f"{self.describe()} is missing"
+        if not valid:
+            return f"{self.describe()} is INVALID, its concurrent build failed"
+        return None
+
+    def _is_valid(self, connection: Connection) -> Optional[bool]:
+        """True or False for an existing index, None when there is none"""
+        return connection.execute(
+            text(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ),
+            {"name": self.name}
+        ).scalar()
+
+
+class RunSQL:
+    """Run SQL statements in the migration's transaction"""
+
+    transactional = True
+
+    def __init__(self, *statements: str, description: Optional[str] = None):
+        self.statements = statements
+        self.description = description
+
+    def describe(self) -> str:
+        return self.description or "; ".join(self.statements)
+
+    def apply(self, connection: Connection) -> None:
+        for statement in self.statements:
+            connection.execute(text(statement))
+
+    def verify(self, connection: Connection) -> Optional[str]:
+        return None
+
+
+class RunPython:
+    """Call function(connection) in the migration's transaction, e.g. to backfill a table"""
+
+    transactional = True
+
+    def __init__(self, function: Callable[[Connection], None], description: str):
+        self.function = function
+        self.description = description
+
+    def describe(self) -> str:
+        return self.description
+
+    def apply(self, connection: Connection) -> None:
+        self.function(connection)
+
+    def verify(self, connection: Connection) -> Optional[str]:
+        return None
+
+
+class Migration:
+    """A numbered schema change, applied once and recorded in schema_migration"""
+
+    def __init__(self, version: int, description: str, operations: Sequence):
+        self.version = version
+        self.description = description
+        self.operations = list(operations)
+
+    def __repr__(self) -> str:
+        return f"{self.version:04d} {self.description}"
+
+
+def load_migrations() -> List[Migration]:
+    """
+    Collect the migrations defined in this package, ordered by version
+
+    Each vNNNN_<name>.py module exposes a `migration` attribute.
+
+    Returns:
+        Migrations sorted by version
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        if not module_info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(module.migration)
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions: {versions}")
+    return migrations
@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from database.migrations import Migration, load_migrations
+from models.schema_migration import SchemaMigration
+
+# Any constant works, it only has to be the same for every runner
+MIGRATION_LOCK_ID = 72_201_001
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations in version order and checks applied ones.
+
+    Concurrent index builds cannot run in a transaction, so a migration is not
+    atomic: its operations are idempotent and a failed migration is simply run
+    again. A Postgres advisory lock keeps several workers or deploys from
+    migrating at the same time.
+    """
+
+    def __init__(self, engine: Engine, migrations: Optional[List[Migration]] = None):
+        self.engine = engine
+        self.migrations = migrations if migrations is not None else load_migrations()
+
+    def applied(self, connection: Connection) -> Dict[int, SchemaMigration]:
+        if not inspect(connection).has_table(SchemaMigration.__tablename__):
+            return {}
+        rows = connection.execute(select(SchemaMigration.__table__)).mappings().all()
+        return {row["version"]: SchemaMigration(**row) for row in rows}
+
+    def upgrade(self, target: Optional[int] = None) -> List[Migration]:
+        """
+        Apply pending migrations up to target
+
+        Args:
+            target: Last version to apply, all migrations when omitted
+
+        Returns:
+            Migrations applied by this call
+        """
+        applied_now = []
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            try:
+                SchemaMigration.__table__.create(connection, checkfirst=True)
+                applied = self.applied(connection)
+
+                for migration in self.migrations:
+                    if migration.version in applied:
+                        continue
+                    if target is not None and migration.version > target:
+                        break
+                    self._apply(migration, connection)
+                    applied_now.append(migration)
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        return applied_now
+
+    def verify(self) -> List[str]:
+        """
+        Check that every migration is applied and its objects exist and are valid
+
+        Returns:
+            Problems found, empty when the schema is up to date
+        """
+        problems = []
+        with self.engine.connect() as connection:
+            applied = self.applied(connection)
+            for migration in self.migrations:
+                if migration.version not in applied:
+                    problems.append(f"{migration!r}: not applied")
+                    continue
+                for operation in migration.operations:
+                    problem = operation.verify(connection)
+                    if problem:
+                        problems.append(f"{migration!r}: {problem}")
+        return problems
+
+    def status(self) -> List[str]:
+        with self.engine.connect() as connection:
+            applied = self.applied(connection)
+        lines = []
+        for migration in self.migrations:
+            record = applied.get(migration.version)
+            state = f"applied {record.applied_at:%Y-%m-%d %H:%M:%S}" if record else "pending"
+            lines.append(f"{migration!r}: {state}")
+        return lines
+
+    def _apply(self, migration: Migration, connection: Connection) -> None:
+        for operation in migration.operations:
+            print(f"  {migration.version:04d}: {operation.describe()}")
+            if operation.transactional:
+                with self.engine.begin() as transaction:
+                    operation.apply(transaction)
+            else:
+                operation.apply(connection)
+
+        connection.execute(
+            insert(SchemaMigration).values(version=migration.version, description=migration.description)
+        )
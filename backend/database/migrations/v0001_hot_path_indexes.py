@@ -0,0 +1,24 @@
+from database.migrations import CreateIndex, Migration
+
+migration = Migration(
+    version=1,
+    description="Indexes for book listings, review pages, discounts and order items",
+    operations=[
+        CreateIndex("ix_review_book_id", "review", ["book_id"]),
+        # Review pages filter by book and star rating and sort by date
+        CreateIndex(
+            "ix_review_book_id_rating_star_review_date",
+            "review",
+            ["book_id", "rating_star", "review_date"]
+        ),
+        # Active discount lookups per book
+        CreateIndex(
+            "ix_discount_book_id_discount_end_date",
+            "discount",
+            ["book_id", "discount_end_date"]
+        ),
+        CreateIndex("ix_order_item_order_id", "order_item", ["order_id"]),
+        CreateIndex("ix_book_category_id", "book", ["category_id"]),
+        CreateIndex("ix_book_author_id", "book", ["author_id"]),
+    ]
+)
@@ -0,0 +1,24 @@
+from sqlalchemy.engine import Connection
+
+from database.migrations import CreateIndex, Migration, RunPython, RunSQL
+
+
+def backfill(connection: Connection) -> None:
+    from api.v1.services.book_search import BookSearchService
+    connection.execute(BookSearchService.refresh_statement())
+
+
+migration = Migration(
+    version=2,
+    description="Full-text search documents for books",
+    operations=[
+        RunSQL(
+            "CREATE TABLE IF NOT EXISTS book_search ("
+            " book_id INTEGER PRIMARY KEY REFERENCES book (id) ON DELETE CASCADE,"
+            " document TSVECTOR NOT NULL)",
+            description="table book_search"
+        ),
+        CreateIndex("ix_book_search_document", "book_search", ["document"], using="gin"),
+        RunPython(backfill, description="backfill book_search from books and authors"),
+    ]
+)
@@ -0,0 +1,20 @@
+from database.migrations import CreateIndex, Migration, RunSQL
+
+migration = Migration(
+    version=3,
+    description="Idempotency keys for order creation",
+    operations=[
+        RunSQL(
+            "CREATE TABLE IF NOT EXISTS idempotency_key ("
+            " user_id INTEGER NOT NULL REFERENCES \"user\" (id) ON DELETE CASCADE,"
+            " key VARCHAR(255) NOT NULL,"
+            " request_hash VARCHAR(64) NOT NULL,"
+            " response JSONB,"
+            " created_at TIMESTAMP WITH TIME ZONE NOT NULL,"
+            " PRIMARY KEY (user_id, key))",
+            description="table idempotency_key"
+        ),
+        # Retention purge
+        CreateIndex("ix_idempotency_key_created_at", "idempotency_key", ["created_at"]),
+    ]
+)
@@ -0,0 +1,18 @@
+from database.migrations import CreateIndex, Migration, RunSQL
+
+migration = Migration(
+    version=4,
+    description="Item counts and history indexes for orders",
+    operations=[
+        RunSQL(
+            'ALTER TABLE "order" ADD COLUMN IF NOT EXISTS item_count INTEGER NOT NULL DEFAULT 0',
+            'UPDATE "order" o SET item_count = i.item_count'
+            " FROM (SELECT order_id, sum(quantity) AS item_count FROM order_item GROUP BY order_id) i"
+            " WHERE i.order_id = o.id",
+            description="column order.item_count with backfill"
+        ),
+        CreateIndex("ix_order_user_id_order_date_id", "order", ["user_id", "order_date", "id"]),
+        # Admin history across users
+        CreateIndex("ix_order_order_date_id", "order", ["order_date", "id"]),
+    ]
+)
@@ -0,0 +1,11 @@
+from database.migrations import CreateIndex, Migration
+
+migration = Migration(
+    version=5,
+    description="Expiry and revoked indexes for the refresh token purge",
+    operations=[
+        CreateIndex("ix_token_expires_at", "token", ["expires_at"]),
+        # Revoked tokens are a small share of the table
+        CreateIndex("ix_token_revoked", "token", ["id"], where="revoked"),
+    ]
+)
@@ -1,6 +1,9 @@
 import os
 from sqlmodel import SQLModel, create_engine, Session
-from typing import Generator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import AsyncGenerator, Generator, Optional
+
+from database.pool import PoolMetrics, TimedAsyncQueuePool, TimedQueuePool
 
 
 class PostgresDatabase:
@@ -25,7 +28,46 @@ class PostgresDatabase:
         )
 
         # Create the database engine
-        self.engine = create_engine(self.DATABASE_URL, echo=True)
+        self.engine = create_engine(
+            self.DATABASE_URL,
+            poolclass=TimedQueuePool,
+            **self.engine_options()
+        )
+        self.engine.pool.metrics = PoolMetrics()
+
+        # Async engine for the async endpoints, psycopg picks its async driver
+        self.async_engine = create_async_engine(
+            self.DATABASE_URL,
+            poolclass=TimedAsyncQueuePool,
+            **self.engine_options()
+        )
+        self.async_engine.pool.metrics = PoolMetrics()
+        # Objects stay loaded after commit, async sessions cannot lazy-load them again
+        self.async_session_factory = async_sessionmaker(self.async_engine, expire_on_commit=False)
+
+    @staticmethod
+    def engine_options() -> dict:
+        """Engine and pool settings from the environment, the pools are per engine and per worker"""
+        options = {
+            "echo": os.getenv("DB_ECHO", "false").lower() == "true",
+            "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+            "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        }
+        # Milliseconds, set on every new connection so runaway queries are cancelled server side
+        statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+        if statement_timeout > 0:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+        return options
+
+    def pool_stats(self) -> dict:
+        """Checkout wait times and saturation of both connection pools"""
+        return {
+            "sync": self.engine.pool.metrics.snapshot(self.engine.pool),
+            "async": self.async_engine.pool.metrics.snapshot(self.async_engine.pool),
+        }
 
     def create_db_and_tables(self):
         # Import models here to avoid circular imports
@@ -37,6 +79,11 @@ class PostgresDatabase:
         from models.order_item import OrderItem
         from models.review import Review
         from models.discount import Discount
+        from models.book_stats import BookStats
+        from models.book_effective_price import BookEffectivePrice
+        from models.book_search import BookSearch
+        from models.schema_migration import SchemaMigration
+        from models.idempotency_key import IdempotencyKey
         # Create tables
         SQLModel.metadata.create_all(self.engine)
 
@@ -45,5 +92,21 @@ class PostgresDatabase:
         with Session(self.engine) as session:
             yield session
             
+    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+        # Function to get an async database session
+        async with self.async_session_factory() as session:
+            yield session
+
     def drop_db(self):
         SQLModel.metadata.drop_all(self.engine)
+
+
+_database: Optional[PostgresDatabase] = None
+
+
+def get_database() -> PostgresDatabase:
+    """Return the process-wide database, creating its engines on first use"""
+    global _database
+    if _database is None:
+        _database = PostgresDatabase()
+    return _database
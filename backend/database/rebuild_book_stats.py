@@ -0,0 +1,30 @@
+from database.postgres import get_database
+from api.v1.services.book_stats import BookStatsService
+
+
+def rebuild_book_stats():
+    """
+    Backfill the book_stats table from the review table.
+
+    Safe to run on a live database, review writes wait until the rebuild commits.
+    """
+    print("Rebuilding book stats from reviews...")
+
+    database = get_database()
+    # Make sure the book_stats table exists before backfilling it
+    database.create_db_and_tables()
+
+    db = next(database.get_session())
+
+    try:
+        count = BookStatsService.rebuild(db)
+        print(f"Rebuilt stats for {count} books")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding book stats: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_book_stats()
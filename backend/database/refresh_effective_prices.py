@@ -0,0 +1,31 @@
+from database.postgres import get_database
+from api.v1.services.effective_price import EffectivePriceService
+
+
+def refresh_effective_prices():
+    """
+    Recompute the book_effective_price projection for every book.
+
+    Book and discount writes keep it up to date, this is for backfills and
+    for discounts changed outside the application.
+    """
+    print("Refreshing effective book prices...")
+
+    database = get_database()
+    # Make sure the book_effective_price table exists before backfilling it
+    database.create_db_and_tables()
+
+    db = next(database.get_session())
+
+    try:
+        count = EffectivePriceService.refresh_all(db)
+        print(f"Refreshed effective prices for {count} books")
+    except Exception as e:
+        db.rollback()
+        print(f"Error refreshing effective prices: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    refresh_effective_prices()
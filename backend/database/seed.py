@@ -13,8 +13,11 @@ from models.order_item import OrderItem
 from models.review import Review
 from models.discount import Discount
 
-from database.postgres import PostgresDatabase
+from database.postgres import get_database
 from api.v1.utils.password import hash_password
+from api.v1.services.book_stats import BookStatsService
+from api.v1.services.effective_price import EffectivePriceService
+from api.v1.services.book_search import BookSearchService
 
 fake = Faker()
 
@@ -35,7 +38,7 @@ def seed_data(num_users=10, num_authors=5, num_categories=3, num_books=20,
     """
     print("Starting database seeding process...")
 
-    db = next(PostgresDatabase().get_session())
+    db = next(get_database().get_session())
 
     try:
         # 1. Create Users
@@ -123,6 +126,7 @@ def seed_data(num_users=10, num_authors=5, num_categories=3, num_books=20,
         ]
         db.add_all(books)
         db.commit()
+        BookSearchService.refresh_all(db)
 
         print(f"Creating discounts...")
         today = date.today()
@@ -182,6 +186,7 @@ def seed_data(num_users=10, num_authors=5, num_categories=3, num_books=20,
         print(f"Successfully created {len(discounts)} discounts")
         db.add_all(discounts)
         db.commit()
+        EffectivePriceService.refresh_all(db)
 
         # 6. Create Orders and Order Items
         print(f"Creating {num_orders} orders with items...")
@@ -230,6 +235,7 @@ def seed_data(num_users=10, num_authors=5, num_categories=3, num_books=20,
 
                 # Calculate total for this item
                 items_total += price * Decimal(str(quantity))
+                order.item_count += quantity
 
             # Update order with total amount
             order.order_amount = items_total
@@ -254,6 +260,11 @@ def seed_data(num_users=10, num_authors=5, num_categories=3, num_books=20,
                 db.add(review)
 
         db.commit()
+
+        # Reviews were inserted directly, so backfill their aggregates
+        print("Rebuilding book stats...")
+        BookStatsService.rebuild(db)
+
         print("Database seeding completed successfully!")
 
     except Exception as e:
@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
 from database.seed import seed_data
-from database.postgres import PostgresDatabase
+from database.postgres import get_database
+from database.migrations.runner import MigrationRunner
+from api.v1.services.top_books import TopBooksService
+from api.v1.services.idempotency import IdempotencyService
+from api.v1.services.password_hasher import PasswordHasher
+from api.v1.services.token_purge import TokenPurgeService
+from api.v1.middlewares.http_cache import HTTPCacheMiddleware
 from api.v1.endpoints import author as author_endpoint
 from api.v1.endpoints import category as category_endpoint
 from api.v1.endpoints import book as book_endpoint
@@ -8,6 +14,7 @@ from api.v1.endpoints import user as user_endpoint
 from api.v1.endpoints import auth as auth_endpoint
 from api.v1.endpoints import default as default_endpoint
 from api.v1.endpoints import order as order_endpoint
+from api.v1.endpoints import catalog_import as catalog_import_endpoint
 from fastapi import FastAPI
 from fastapi.logger import logger
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,8 +28,8 @@ from typing import Generator
 dotenv_path = Path(__file__).resolve().parent.parent.parent / '.env'
 load_dotenv(dotenv_path=dotenv_path)
 
-# Initialize database instance
-db_instance = PostgresDatabase()
+# Process-wide database, shared with the request dependencies
+db_instance = get_database()
 
 app = FastAPI(
     title="Bookworm API",
@@ -30,6 +37,9 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Cache-Control and ETags for public read endpoints, inside CORS so 304s get CORS headers too
+app.add_middleware(HTTPCacheMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -46,6 +56,11 @@ def on_startup():
         if os.getenv("OVERWRITE_DB", "false").lower() == "true":
             db_instance.drop_db()
         db_instance.create_db_and_tables()
+        if os.getenv("MIGRATE_ON_STARTUP", "false").lower() == "true":
+            MigrationRunner(db_instance.engine).upgrade()
+        # Drop idempotency keys past their retention window
+        with Session(db_instance.engine) as db:
+            IdempotencyService.purge_expired(db)
         if os.getenv("SEED_ON_STARTUP", "false").lower() == "true":
             seed_data(
                 num_users=100,
@@ -60,6 +75,21 @@ def on_startup():
         logger.error(f"Error creating database tables: {e}")
 
 
+@app.on_event("startup")
+async def start_background_tasks():
+    # Keep the home page top-N lists in memory
+    TopBooksService.start(db_instance.async_engine)
+    # Delete expired and revoked refresh tokens
+    TokenPurgeService.start(db_instance.async_engine)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await TopBooksService.stop()
+    await TokenPurgeService.stop()
+    PasswordHasher.shutdown()
+
+
 # Include routers
 app.include_router(default_endpoint.router, prefix="/api/v1", tags=["Default"])
 app.include_router(auth_endpoint.router, prefix="/api/v1", tags=["Auth"])
@@ -68,6 +98,7 @@ app.include_router(book_endpoint.router, prefix="/api/v1", tags=["Books v1"])
 app.include_router(category_endpoint.router, prefix="/api/v1", tags=["Categories v1"])
 app.include_router(author_endpoint.router, prefix="/api/v1", tags=["Authors v1"])
 app.include_router(order_endpoint.router, prefix="/api/v1", tags=["Orders v1"])
+app.include_router(catalog_import_endpoint.router, prefix="/api/v1", tags=["Import v1"])
 
 def get_db() -> Generator[Session, None, None]:
     with db_instance.get_session() as db:
@@ -13,8 +13,8 @@ class Book(SQLModel, table=True):
     __tablename__ = "book"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    category_id: Optional[int] = Field(default=None, foreign_key="category.id")
-    author_id: Optional[int] = Field(default=None, foreign_key="author.id")
+    category_id: Optional[int] = Field(default=None, foreign_key="category.id", index=True)
+    author_id: Optional[int] = Field(default=None, foreign_key="author.id", index=True)
 
     book_title: str = Field(max_length=255)
     book_summary: Optional[str] = Field(default=None)
@@ -0,0 +1,43 @@
+from sqlmodel import SQLModel, Field, Column, Numeric
+from sqlalchemy import Index
+from typing import Optional
+from decimal import Decimal
+from datetime import date
+
+
+class BookEffectivePrice(SQLModel, table=True):
+    """Materialized effective price of each book given its best active discount"""
+    __tablename__ = "book_effective_price"
+
+    book_id: Optional[int] = Field(default=None, primary_key=True, foreign_key="book.id")
+    discount_id: Optional[int] = Field(default=None, foreign_key="discount.id", ondelete="SET NULL")
+    final_price: Optional[Decimal] = Field(
+        default=None,
+        sa_column=Column(Numeric(5, 2))
+    )
+    discount_amount: Decimal = Field(
+        default=Decimal("0.00"),
+        sa_column=Column(Numeric(5, 2), nullable=False, server_default="0")
+    )
+    # End date of the active discount, the row must be recomputed on that day
+    expires_on: Optional[date] = Field(default=None, index=True)
+
+
+# Indexes matching the ON_SALE and PRICE listing sorts (book_id is the tiebreaker)
+Index(
+    "ix_book_effective_price_on_sale_desc",
+    BookEffectivePrice.discount_amount.desc(),
+    BookEffectivePrice.final_price,
+    BookEffectivePrice.book_id
+)
+Index(
+    "ix_book_effective_price_on_sale_asc",
+    BookEffectivePrice.discount_amount,
+    BookEffectivePrice.final_price,
+    BookEffectivePrice.book_id
+)
+Index(
+    "ix_book_effective_price_final_price",
+    BookEffectivePrice.final_price,
+    BookEffectivePrice.book_id
+)
@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from typing import Optional
+
+
+class BookSearch(SQLModel, table=True):
+    """Weighted full-text document of each book: title (A), author name (B) and summary (C)"""
+    __tablename__ = "book_search"
+
+    book_id: Optional[int] = Field(default=None, primary_key=True, foreign_key="book.id", ondelete="CASCADE")
+    document: str = Field(sa_column=Column(TSVECTOR, nullable=False))
+
+
+# Lookups by search query only touch the matching books
+Index("ix_book_search_document", BookSearch.document, postgresql_using="gin")
@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+
+
+class BookStats(SQLModel, table=True):
+    """Review aggregates per book, maintained alongside review writes"""
+    __tablename__ = "book_stats"
+
+    book_id: Optional[int] = Field(default=None, primary_key=True, foreign_key="book.id")
+    review_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+    star_1: int = Field(default=0)
+    star_2: int = Field(default=0)
+    star_3: int = Field(default=0)
+    star_4: int = Field(default=0)
+    star_5: int = Field(default=0)
@@ -3,6 +3,7 @@ from typing import Optional, TYPE_CHECKING, List
 from decimal import Decimal
 from datetime import date
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy import Index
 from sqlalchemy.orm import validates
 
 if TYPE_CHECKING:
@@ -64,3 +65,7 @@ class Discount(SQLModel, table=True):
         # Check if any overlapping discounts exist
         result = session.exec(query).first()
         return result is not None
+
+
+# Active discount lookups per book
+Index("ix_discount_book_id_discount_end_date", Discount.book_id, Discount.discount_end_date)
@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Idempotency-Key of a create request with the response it produced, unique per user"""
+    __tablename__ = "idempotency_key"
+
+    user_id: int = Field(primary_key=True, foreign_key="user.id", ondelete="CASCADE")
+    key: str = Field(primary_key=True, max_length=255)
+    # Digest of the request body, a key may not be reused for a different request
+    request_hash: str = Field(max_length=64)
+    response: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        index=True
+    )
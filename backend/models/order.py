@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship, Column, Numeric
+from sqlalchemy import Index
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal
@@ -18,7 +19,14 @@ class Order(SQLModel, table=True):
         default=None,
         sa_column=Column(Numeric(8, 2))
     )
+    # Total quantity of the order items, kept with the order so listings skip order_item
+    item_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     # Relationships
     user: Optional["User"] = Relationship(back_populates="orders")
     order_items: List["OrderItem"] = Relationship(back_populates="order")
+
+
+# Order history pages sort by date, id is the tiebreaker, per user or across users
+Index("ix_order_user_id_order_date_id", Order.user_id, Order.order_date, Order.id)
+Index("ix_order_order_date_id", Order.order_date, Order.id)
@@ -11,7 +11,7 @@ class OrderItem(SQLModel, table=True):
     __tablename__ = "order_item"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    order_id: Optional[int] = Field(default=None, foreign_key="order.id")
+    order_id: Optional[int] = Field(default=None, foreign_key="order.id", index=True)
     book_id: Optional[int] = Field(default=None, foreign_key="book.id")
     quantity: int = Field(default=1, gt=0, le=8)
     price: Optional[Decimal] = Field(
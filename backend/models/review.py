@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime, timezone
 
@@ -10,7 +11,7 @@ class Review(SQLModel, table=True):
     __tablename__ = "review"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    book_id: Optional[int] = Field(default=None, foreign_key="book.id")
+    book_id: Optional[int] = Field(default=None, foreign_key="book.id", index=True)
     review_title: str = Field(max_length=120)
     review_details: Optional[str] = Field(default=None)
     review_date: datetime = Field(
@@ -20,3 +21,12 @@ class Review(SQLModel, table=True):
 
     # Relationships
     book: Optional["Book"] = Relationship(back_populates="reviews")
+
+
+# Review pages filter by book and star rating and sort by date
+Index(
+    "ix_review_book_id_rating_star_review_date",
+    Review.book_id,
+    Review.rating_star,
+    Review.review_date
+)
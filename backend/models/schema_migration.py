@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field
+
+
+class SchemaMigration(SQLModel, table=True):
+    """Migrations applied to this database, see database/migrations"""
+    __tablename__ = "schema_migration"
+
+    version: int = Field(primary_key=True)
+    description: str = Field(max_length=255)
+    applied_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
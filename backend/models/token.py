@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 
 # Create a function that returns the current UTC time
 def get_utc_now() -> datetime:
@@ -12,5 +13,10 @@ class Token(SQLModel, table=True):
     jti: str = Field(index=True, unique=True)  # JWT ID
     refresh_token: str
     created_at: datetime = Field(default_factory=get_utc_now)
-    expires_at: datetime
+    # Expired tokens are purged in the background
+    expires_at: datetime = Field(index=True)
     revoked: bool = Field(default=False)
+
+
+# Revoked tokens waiting for the purge
+Index("ix_token_revoked", Token.id, postgresql_where=Token.revoked)